@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
-import copy
+from collections import deque
+from functools import lru_cache
 import logging
-from typing import Any, Mapping
-from uuid import uuid4
+import os
+from types import MappingProxyType
+from typing import Any, Final, Mapping
+from uuid import UUID
 
 import voluptuous as vol
 
@@ -56,16 +59,43 @@ from .utils.light_sequence import LightSequence
 
 _LOGGER = logging.getLogger(__name__)
 
+_EMPTY_MAP: Mapping[str, Any] = MappingProxyType({})
 
-ADD_NOTIFY_DEFAULTS = {
-    CONF_NAME: "New Notification Name",
-    CONF_NOTIFY_PATTERN: [],
-    CONF_RGB_SELECTOR: WARM_WHITE_RGB,
-    CONF_DELAY_TIME: {"seconds": 0},
-    CONF_EXPIRE_ENABLED: False,
-    CONF_PRIORITY: DEFAULT_PRIORITY,
-    CONF_PEEK_ENABLED: True,
-}
+_USER_MENU_OPTIONS: Final = ("new_pool", "new_light")
+_POOL_MENU_OPTIONS: Final = (
+    "add_notification",
+    "add_notification_sample",
+    "add_notification_copy",
+    "modify_notification_select",
+    "delete_notification",
+)
+
+_UUID_POOL_SIZE = 32
+_uuid_pool: deque[str] = deque()
+
+
+def _pooled_uuid_hex() -> str:
+    """Return a random uuid4 hex string, refilling the pool with one urandom read."""
+    if not _uuid_pool:
+        raw = os.urandom(16 * _UUID_POOL_SIZE)
+        _uuid_pool.extend(
+            UUID(bytes=raw[i : i + 16], version=4).hex
+            for i in range(0, len(raw), 16)
+        )
+    return _uuid_pool.popleft()
+
+
+ADD_NOTIFY_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {
+        CONF_NAME: "New Notification Name",
+        CONF_NOTIFY_PATTERN: [],
+        CONF_RGB_SELECTOR: WARM_WHITE_RGB,
+        CONF_DELAY_TIME: {"seconds": 0},
+        CONF_EXPIRE_ENABLED: False,
+        CONF_PRIORITY: DEFAULT_PRIORITY,
+        CONF_PEEK_ENABLED: True,
+    }
+)
 ADD_NOTIFY_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_NAME, default=ADD_NOTIFY_DEFAULTS[CONF_NAME]): cv.string,
@@ -98,18 +128,39 @@ ADD_NOTIFY_SCHEMA = vol.Schema(
     }
 )
 
+
+@lru_cache(maxsize=32)
+def _get_modify_notify_schema(uuid: str) -> vol.Schema:
+    """Return the Add Notification schema extended for modifying `uuid`."""
+    # ConstantSelector submits its configured value, so the uuid must live in
+    # the schema itself rather than in the suggested values.
+    return ADD_NOTIFY_SCHEMA.extend(
+        {
+            # Flag to indicate modify_notification has been submitted
+            vol.Optional(CONF_FORCE_UPDATE): selector.ConstantSelector(
+                selector.ConstantSelectorConfig(label="", value=True)
+            ),
+            vol.Optional(CONF_UNIQUE_ID): selector.ConstantSelector(
+                selector.ConstantSelectorConfig(label="", value=uuid)
+            ),
+        }
+    )
+
+
 ADD_POOL_SCHEMA = vol.Schema({vol.Required(CONF_NAME): cv.string})
 
-ADD_LIGHT_DEFAULTS = {
-    CONF_NAME: "New Notification Light",
-    CONF_RGB_SELECTOR: WARM_WHITE_RGB,
-    CONF_PRIORITY: DEFAULT_PRIORITY,
-    CONF_DYNAMIC_PRIORITY: True,
-    CONF_DELAY: True,
-    CONF_DELAY_TIME: {"seconds": 5},
-    CONF_PEEK_TIME: {"seconds": 5},
-    CONF_RESTORE_POWER: False,
-}
+ADD_LIGHT_DEFAULTS: Mapping[str, Any] = MappingProxyType(
+    {
+        CONF_NAME: "New Notification Light",
+        CONF_RGB_SELECTOR: WARM_WHITE_RGB,
+        CONF_PRIORITY: DEFAULT_PRIORITY,
+        CONF_DYNAMIC_PRIORITY: True,
+        CONF_DELAY: True,
+        CONF_DELAY_TIME: {"seconds": 5},
+        CONF_PEEK_TIME: {"seconds": 5},
+        CONF_RESTORE_POWER: False,
+    }
+)
 ADD_LIGHT_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_NAME, default=ADD_LIGHT_DEFAULTS[CONF_NAME]): cv.string,
@@ -142,7 +193,28 @@ ADD_LIGHT_SCHEMA = vol.Schema(
     }
 )
 
-SUBSCRIPTION_DEFAULTS = {TYPE_POOL: [], CONF_ENTITIES: []}
+# Reconfigure doesn't allow changing 'name'. Use 'rename' for that.
+_ADD_LIGHT_SCHEMA_NO_NAME = vol.Schema(
+    {k: v for k, v in ADD_LIGHT_SCHEMA.schema.items() if k != CONF_NAME}
+)
+
+
+@lru_cache(maxsize=8)
+def _get_new_light_schema(exclude_entities: tuple[str, ...]) -> vol.Schema:
+    """Return the New Light schema excluding the given light entities."""
+    # Selectors are shared; only the entity selector is replaced
+    schema = dict(ADD_LIGHT_SCHEMA.schema)
+    schema[CONF_ENTITY_ID] = selector.EntitySelector(
+        selector.EntitySelectorConfig(
+            domain=LIGHT_DOMAIN, exclude_entities=list(exclude_entities)
+        )
+    )
+    return vol.Schema(schema)
+
+
+SUBSCRIPTION_DEFAULTS: Mapping[str, list] = MappingProxyType(
+    {TYPE_POOL: [], CONF_ENTITIES: []}
+)
 SUBSCRIPTION_SCHEMA = vol.Schema(
     {
         vol.Optional(
@@ -172,11 +244,16 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
     VERSION = 1
     MINOR_VERSION = 1
 
+    def __init__(self) -> None:
+        """Initialize config flow."""
+        super().__init__()
+        self._exclude_entities: tuple[str, ...] | None = None
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Handle a flow initialized by the user."""
-        return self.async_show_menu(menu_options=["new_pool", "new_light"])
+        return self.async_show_menu(menu_options=_USER_MENU_OPTIONS)
 
     async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
@@ -206,12 +283,8 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
                 reason="Changes saved",
             )
 
-        # Remove 'name' from schema. Use 'rename' for that.
-        schema = vol.Schema(
-            {k: v for k, v in ADD_LIGHT_SCHEMA.schema.items() if k != CONF_NAME}
-        )
         schema = self.add_suggested_values_to_schema(
-            schema, suggested_values=entry.data
+            _ADD_LIGHT_SCHEMA_NO_NAME, suggested_values=entry.data
         )
         return self.async_show_form(step_id="reconfigure_light", data_schema=schema)
 
@@ -231,21 +304,20 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
     ) -> ConfigFlowResult:
         """Handle a New Light flow."""
         if user_input is not None:
+            self._exclude_entities = None
             return self.async_create_entry(
                 title=f"[Light] {user_input[CONF_NAME]}",
                 data=user_input | {CONF_TYPE: TYPE_LIGHT},
             )
 
-        exclude_entities = HassData.get_domain_light_entity_ids(self.hass)
-        exclude_entities.extend(HassData.get_wrapped_light_entity_ids(self.hass))
-        schema = {k: copy.copy(v) for k, v in ADD_LIGHT_SCHEMA.schema.items()}
-        schema[CONF_ENTITY_ID] = selector.EntitySelector(
-            selector.EntitySelectorConfig(
-                domain=LIGHT_DOMAIN, exclude_entities=exclude_entities
-            )
-        )
+        # Only scan the registry once per flow, form redraws reuse the result
+        if self._exclude_entities is None:
+            exclude_entities = HassData.get_domain_light_entity_ids(self.hass)
+            exclude_entities += HassData.get_wrapped_light_entity_ids(self.hass)
+            self._exclude_entities = tuple(sorted(exclude_entities))
+        schema = _get_new_light_schema(self._exclude_entities)
 
-        return self.async_show_form(step_id="new_light", data_schema=vol.Schema(schema))
+        return self.async_show_form(step_id="new_light", data_schema=schema)
 
     @staticmethod
     @callback
@@ -262,6 +334,10 @@ class ConfigFlowHandler(ConfigFlow, domain=DOMAIN):
 
 
 class HassDataOptionsFlow(OptionsFlow):
+    # OptionsFlow keeps its own __dict__, the slot just makes _config_entry a
+    # direct descriptor read.
+    __slots__ = ("_config_entry",)
+
     def __init__(self, config_entry: ConfigEntry):
         self._config_entry = config_entry
 
@@ -270,63 +346,59 @@ class HassDataOptionsFlow(OptionsFlow):
     ) -> ConfigFlowResult:
         # Trigger a Config Update by setting a unique CONF_FORCE_UPDATE
         return self.async_create_entry(
-            title=title, data=data | {CONF_FORCE_UPDATE: uuid4().hex}
+            title=title, data={**data, CONF_FORCE_UPDATE: _pooled_uuid_hex()}
         )
 
 
 class PoolOptionsFlowHandler(HassDataOptionsFlow):
     """Handle options flow for a Pool"""
 
+    __slots__ = ("_notification_options",)
+
     def __init__(self, config_entry: ConfigEntry) -> None:
         """Initialize options flow."""
         super().__init__(config_entry)
+        # Select options for this flow. The flow ends on any config update, so
+        # a new flow always starts with a fresh list.
+        self._notification_options: list[dict[str, str]] | None = None
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Launch the options flow."""
-        # forward to pool_init to differentiate in strings.json
-        return await self.async_step_pool_init(user_input)
-
-    async def async_step_pool_init(
-        self, user_input: dict[str, Any] | None = None
-    ) -> ConfigFlowResult:
-        """Launch the options flow."""
+        # Show as pool_init to differentiate in strings.json
         return self.async_show_menu(
-            step_id="pool_init",
-            menu_options=[
-                "add_notification",
-                "add_notification_sample",
-                "add_notification_copy",
-                "modify_notification_select",
-                "delete_notification",
-            ],
+            step_id="pool_init", menu_options=_POOL_MENU_OPTIONS
         )
 
+    async_step_pool_init = async_step_init
+
     async def async_step_add_notification(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Launch the Add Notification form."""
-        errors: dict[str, str] = {}
-        desc_placeholders: dict[str, str] = {}
-        schema = ADD_NOTIFY_SCHEMA
-        if user_input is not None:
-            # Validate
-            try:
-                LightSequence.create_from_pattern(user_input.get(CONF_NOTIFY_PATTERN))
-            except Exception as e:
-                errors["pattern"] = str(e)
-                desc_placeholders["error_detail"] = str(e)
-
-            # If no errors continue
-            if len(errors) == 0:
-                return await self.async_step_finish_add_notification(user_input)
-
-            # If errors then load in the set values and show the form again
-            schema = self.add_suggested_values_to_schema(
-                schema, suggested_values=user_input
+        if user_input is None:
+            return self.async_show_form(
+                step_id="add_notification", data_schema=ADD_NOTIFY_SCHEMA
             )
 
+        errors: dict[str, str] = {}
+        desc_placeholders: dict[str, str] = {}
+        # Validate
+        try:
+            LightSequence.validate_pattern(user_input.get(CONF_NOTIFY_PATTERN))
+        except Exception as e:
+            errors["pattern"] = str(e)
+            desc_placeholders["error_detail"] = str(e)
+
+        # If no errors continue
+        if not errors:
+            return await self.async_step_finish_add_notification(user_input)
+
+        # If errors then load in the set values and show the form again
+        schema = self.add_suggested_values_to_schema(
+            ADD_NOTIFY_SCHEMA, suggested_values=user_input
+        )
         return self.async_show_form(
             step_id="add_notification",
             data_schema=schema,
@@ -359,8 +431,9 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
     ) -> ConfigFlowResult:
         """Launch the Copy Notification Selection form."""
         if user_input is not None:
-            entities = HassData.get_all_entities(self.hass, self._config_entry.entry_id)
-            entity_to_copy = entities.get(user_input[CONF_UNIQUE_ID])
+            entity_to_copy = HassData.get_entity(
+                self.hass, self._config_entry.entry_id, user_input[CONF_UNIQUE_ID]
+            )
             state = (
                 self.hass.states.get(entity_to_copy.entity_id)
                 if entity_to_copy is not None
@@ -368,19 +441,23 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
             )
             if state is None:
                 return self.async_abort(reason="Can't locate notification to copy")
-            defaults = (
-                ADD_NOTIFY_DEFAULTS
-                | state.attributes
-                | {CONF_NAME: state.attributes[CONF_NAME] + " (copy)"}
-            )
+            defaults = {**ADD_NOTIFY_DEFAULTS, **state.attributes}
+            defaults[CONF_NAME] = state.attributes[CONF_NAME] + " (copy)"
             schema = self.add_suggested_values_to_schema(
                 ADD_NOTIFY_SCHEMA, suggested_values=defaults
             )
             return self.async_show_form(step_id="add_notification", data_schema=schema)
 
         # Generate list of notifications from pool to select from
-        select_list = self._get_notifications()
-        options_schema = vol.Schema({vol.Required(CONF_UNIQUE_ID): vol.In(select_list)})
+        options_schema = vol.Schema(
+            {
+                vol.Required(CONF_UNIQUE_ID): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=self._get_notification_options()
+                    )
+                )
+            }
+        )
 
         return self.async_show_form(
             step_id="add_notification_copy", data_schema=options_schema
@@ -394,9 +471,15 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
             return await self.async_step_modify_notification(user_input)
 
         # Generate list of notifications from pool to select from
-        select_list = self._get_notifications()
-
-        options_schema = vol.Schema({vol.Required(CONF_UNIQUE_ID): vol.In(select_list)})
+        options_schema = vol.Schema(
+            {
+                vol.Required(CONF_UNIQUE_ID): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        options=self._get_notification_options()
+                    )
+                )
+            }
+        )
 
         return self.async_show_form(
             step_id="modify_notification_select", data_schema=options_schema
@@ -407,7 +490,9 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
     ) -> ConfigFlowResult:
         """Launch the Modify Notification form."""
         item_data: dict | None = None
-        ntfctn_entries = self._config_entry.options.get(CONF_NTFCTN_ENTRIES, {})
+        ntfctn_entries = (
+            self._config_entry.options.get(CONF_NTFCTN_ENTRIES) or _EMPTY_MAP
+        )
         if uuid := user_input.get(CONF_UNIQUE_ID):
             item_data = ntfctn_entries.get(uuid)
 
@@ -419,12 +504,12 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
         if CONF_FORCE_UPDATE in user_input:
             # Validate
             try:
-                LightSequence.create_from_pattern(user_input.get(CONF_NOTIFY_PATTERN))
+                LightSequence.validate_pattern(user_input.get(CONF_NOTIFY_PATTERN))
             except Exception as e:
                 errors["pattern"] = str(e)
                 desc_placeholders["error_detail"] = str(e)
             # FORCE_UPDATE was just a flag to indicate modification is done
-            if len(errors) == 0:
+            if not errors:
                 user_input.pop(CONF_FORCE_UPDATE)
                 return await self.async_step_finish_add_notification(user_input)
 
@@ -432,23 +517,12 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
             item_data.update(user_input)
 
         # Merge in default values
-        item_data = ADD_NOTIFY_DEFAULTS | item_data | {CONF_FORCE_UPDATE: 1}
+        item_data = {**ADD_NOTIFY_DEFAULTS, **item_data, CONF_FORCE_UPDATE: 1}
 
-        # Add in the extra 'Force Update' flag and Unique ID
-        schema = ADD_NOTIFY_SCHEMA.extend(
-            {
-                # Flag to indicate modify_notification has been submitted
-                vol.Optional(CONF_FORCE_UPDATE): selector.ConstantSelector(
-                    selector.ConstantSelectorConfig(label="", value=True)
-                ),
-                vol.Optional(CONF_UNIQUE_ID): selector.ConstantSelector(
-                    selector.ConstantSelectorConfig(label="", value=uuid)
-                ),
-            }
+        schema = self.add_suggested_values_to_schema(
+            _get_modify_notify_schema(uuid), suggested_values=item_data
         )
 
-        schema = self.add_suggested_values_to_schema(schema, suggested_values=item_data)
-
         return self.async_show_form(
             step_id="modify_notification",
             data_schema=schema,
@@ -468,10 +542,13 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
             )
 
         # Generate list of notifications from pool to select from
-        select_list = self._get_notifications()
         options_schema = vol.Schema(
             {
-                vol.Optional(CONF_DELETE): cv.multi_select(select_list),
+                vol.Optional(CONF_DELETE): selector.SelectSelector(
+                    selector.SelectSelectorConfig(
+                        multiple=True, options=self._get_notification_options()
+                    )
+                ),
             }
         )
         return self.async_show_form(
@@ -482,35 +559,48 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Finalize adding the notification."""
-        # ensure defaults are set
-        user_input = ADD_NOTIFY_DEFAULTS | user_input
-        uuid = user_input.get(CONF_UNIQUE_ID)
-        if uuid is None:
-            uuid = uuid or uuid4().hex
-            user_input[CONF_UNIQUE_ID] = uuid
+        # ensure defaults and a unique id are set, merging in a single pass
+        uuid = user_input.get(CONF_UNIQUE_ID) or _pooled_uuid_hex()
+        user_input = {**ADD_NOTIFY_DEFAULTS, **user_input, CONF_UNIQUE_ID: uuid}
 
         # Add to the entry to hass_data
-        ntfctn_entries = self._config_entry.options.get(CONF_NTFCTN_ENTRIES, {})
+        ntfctn_entries = self._config_entry.options.get(CONF_NTFCTN_ENTRIES) or {}
         ntfctn_entries[uuid] = user_input
 
         return await self._async_trigger_conf_update(
             data=self._config_entry.options | {CONF_NTFCTN_ENTRIES: ntfctn_entries}
         )
 
+    @callback
+    def _get_notification_options(self) -> list[dict[str, str]]:
+        """Return the notification select options, sorted by priority."""
+        if self._notification_options is None:
+            self._notification_options = [
+                {"value": uid, "label": label}
+                for uid, label in self._get_notifications().items()
+            ]
+        return self._notification_options
+
     @callback
     def _get_notifications(self) -> dict[str, str]:
         # Generate list of notifications from pool to select from, sorted by priority
-        ntfctns = self._config_entry.options.get(CONF_NTFCTN_ENTRIES, {})
-        ntfctns = sorted(
-            ntfctns.items(), key=lambda x: x[1].get(CONF_PRIORITY), reverse=True
+        ntfctns = (
+            self._config_entry.options.get(CONF_NTFCTN_ENTRIES) or _EMPTY_MAP
         )
+        # Decorate with negated priority so the sort runs on plain tuple compares.
+        # The insertion index keeps equal priorities in their original order.
+        decorated = [
+            (-ntfctn.get(CONF_PRIORITY, DEFAULT_PRIORITY), idx, uid, ntfctn)
+            for idx, (uid, ntfctn) in enumerate(ntfctns.items())
+        ]
+        decorated.sort()
 
         entities = HassData.get_all_entities(self.hass, self._config_entry.entry_id)
+        get_entity = entities.__getitem__
         select_list: dict[str, str] = {}
-        for uid, ntfctn in ntfctns:
-            entity = entities[uid]
+        for neg_prio, _, uid, ntfctn in decorated:
             select_list[uid] = (
-                f"{ntfctn.get(CONF_NAME)} [{entity.entity_id}] Prio: {ntfctn.get(CONF_PRIORITY):.0f}"
+                f"{ntfctn.get(CONF_NAME)} [{get_entity(uid).entity_id}] Prio: {-neg_prio:.0f}"
             )
         return select_list
 
@@ -518,23 +608,20 @@ class PoolOptionsFlowHandler(HassDataOptionsFlow):
 class LightOptionsFlowHandler(HassDataOptionsFlow):
     """Handle an options flow."""
 
+    __slots__ = ()
+
     def __init__(self, config_entry: ConfigEntry) -> None:
         """Initialize options flow."""
         super().__init__(config_entry)
 
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
-    ) -> ConfigFlowResult:
-        """Launch the options flow."""
-        # forward to light_init to differentiate in strings.json
-        return await self.async_step_light_init(user_input)
-
-    async def async_step_light_init(
-        self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
         """Launch the options flow."""
         return await self.async_step_subscriptions(user_input)
 
+    async_step_light_init = async_step_init
+
     async def async_step_subscriptions(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -550,16 +637,26 @@ class LightOptionsFlowHandler(HassDataOptionsFlow):
         # TODO: Set up pool subscriptions
         # TODO: Update light when pool subscriptions change
 
-        # Set up multi-select
-        schema = {k: copy.copy(v) for k, v in SUBSCRIPTION_SCHEMA.schema.items()}
-        schema[TYPE_POOL] = selector.SelectSelector(
-            selector.SelectSelectorConfig(multiple=True, options=pool_items)
+        # Set up multi-select. Markers compare equal to their key so TYPE_POOL
+        # replaces the template's pool selector while keeping its marker.
+        schema = vol.Schema(
+            {
+                **SUBSCRIPTION_SCHEMA.schema,
+                TYPE_POOL: selector.SelectSelector(
+                    selector.SelectSelectorConfig(multiple=True, options=pool_items)
+                ),
+            }
         )
-        schema = vol.Schema(schema)
         # Get subscribed pools, filtering out pools that don't exist
-        cur_subs: dict = self._config_entry.options.get(CONF_SUBSCRIPTION, {})
-        cur_subs[TYPE_POOL] = [x for x in cur_subs.get(TYPE_POOL, []) if x in pools]
-        defaults: dict[str, dict] = SUBSCRIPTION_DEFAULTS | cur_subs
+        cur_subs: Mapping = (
+            self._config_entry.options.get(CONF_SUBSCRIPTION) or _EMPTY_MAP
+        )
+        defaults: dict[str, list] = {
+            TYPE_POOL: [x for x in cur_subs.get(TYPE_POOL, ()) if x in pools],
+            CONF_ENTITIES: cur_subs.get(
+                CONF_ENTITIES, SUBSCRIPTION_DEFAULTS[CONF_ENTITIES]
+            ),
+        }
         schema = self.add_suggested_values_to_schema(schema, suggested_values=defaults)
 
         return self.async_show_form(step_id="subscriptions", data_schema=schema)
@@ -32,3 +32,4 @@ INIT_STATE_UPDATE_DELAY_SEC: Final = 1
 DEFAULT_PRIORITY: Final = 1000
 MAXIMUM_PRIORITY: Final = 99999999
 EXPECTED_SERVICE_CALL_TIMEOUT: Final = 5
+MIN_COMMAND_INTERVAL_SEC: Final = 1 / 30
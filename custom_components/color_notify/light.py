@@ -1,14 +1,16 @@
 """Light platform for ColorNotify integration."""
 
 import asyncio
-import time
-from collections.abc import Callable, Coroutine
-from copy import copy
-from dataclasses import dataclass, replace
+from bisect import bisect_left, insort
+from collections import deque
+from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import timedelta
-from functools import cached_property
+from functools import cached_property, lru_cache
+from itertools import count
 import logging
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from homeassistant.components.light import (
     ATTR_BRIGHTNESS,
@@ -27,6 +29,7 @@ from homeassistant.const import (
     CONF_DELAY_TIME,
     CONF_ENTITIES,
     CONF_ENTITY_ID,
+    EVENT_STATE_CHANGED,
     SERVICE_TURN_OFF,
     SERVICE_TURN_ON,
     STATE_OFF,
@@ -36,7 +39,11 @@ from homeassistant.const import (
 from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_call_later, async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_entity_registry_updated_event,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.util.color import (
     color_hs_to_RGB,
@@ -64,15 +71,34 @@ from .const import (
     EXPECTED_SERVICE_CALL_TIMEOUT,
     INIT_STATE_UPDATE_DELAY_SEC,
     MAXIMUM_PRIORITY,
+    MIN_COMMAND_INTERVAL_SEC,
     OFF_RGB,
     TYPE_POOL,
     WARM_WHITE_RGB,
 )
 from .utils.hass_data import HassData
-from .utils.light_sequence import ColorInfo, LightSequence
+from .utils.light_sequence import ColorInfo, LightSequence, shared_color_info
 
 _LOGGER = logging.getLogger(__name__)
 
+# HA's color converters are pure and lights see a small palette, so memoize the
+# ones run on every state write or wrapped light command.
+_rgb_to_hsv = lru_cache(maxsize=256)(color_RGB_to_hsv)
+_hs_to_xy = lru_cache(maxsize=256)(color_hs_to_xy)
+_xy_to_temperature = lru_cache(maxsize=256)(color_xy_to_temperature)
+# Color sliders emit many nearby values on turn_on
+_temperature_to_rgb = lru_cache(maxsize=1024)(color_temperature_to_rgb)
+_hs_to_rgb = lru_cache(maxsize=1024)(color_hs_to_RGB)
+_hsv_to_rgb = lru_cache(maxsize=1024)(color_hsv_to_RGB)
+
+
+@lru_cache(maxsize=256)
+def _rgb_to_hs_and_brightness(rgb: tuple) -> tuple[tuple[float, float], float]:
+    """Return the HS color and 0-255 brightness for an RGB color."""
+    h, s, v = color_RGB_to_hsv(*rgb)
+    # Re-scale 'v' from 0-100 to 0-255
+    return (h, s), (255 / 100) * v
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -91,7 +117,6 @@ async def async_setup_entry(
     async_add_entities([new_entity])
 
 
-@dataclass
 class _NotificationSequence:
     """A color sequence to queue on the light."""
 
@@ -106,15 +131,15 @@ class _NotificationSequence:
         self.priority: int = priority
 
         self._pattern: list[str | ColorInfo] = pattern[:]
-        self._sequence: LightSequence = LightSequence()
+        self._sequence: LightSequence = LightSequence.create_from_pattern(pattern)
         self._notify_id: str | None = notify_id
         self._clear_delay: float | None = clear_delay
-        self._task: asyncio.Task | None = None
-        self._stop_event: asyncio.Event | None = None
-        self._color: ColorInfo = ColorInfo(OFF_RGB, 0)
+        self._color: ColorInfo = shared_color_info(OFF_RGB, 0)
         self._peek_enabled: bool = peek_enabled
-        self._step_finished: asyncio.Event = asyncio.Event()
-        self._step_finished.set()
+        self._hass: HomeAssistant | None = None
+        self._config_entry: ConfigEntry | None = None
+        # Loop time the next step is due, None when not running
+        self._next_deadline: float | None = None
         self.reset()  # Set initial color from pattern
 
     def __repr__(self) -> str:
@@ -126,69 +151,67 @@ class _NotificationSequence:
 
     @property
     def color(self) -> ColorInfo:
-        return copy(self._color)
+        return self._color
 
     @property
     def notify_id(self) -> str | None:
         return self._notify_id
 
-    def wait(self) -> Coroutine:
-        return self._step_finished.wait()
+    @property
+    def next_deadline(self) -> float | None:
+        """Return the loop time the next step is due, or None if not running."""
+        return self._next_deadline
 
     def reset(self):
         """Resets the notification sequence to the beginning"""
-        self._sequence: LightSequence = LightSequence.create_from_pattern(self._pattern)
+        self._sequence.rewind()
         self._color: ColorInfo = (
             self._sequence.color
             if self._sequence.color is not None
-            else ColorInfo(OFF_RGB, 0)
+            else shared_color_info(OFF_RGB, 0)
         )
 
-    async def _worker_func(self, stop_event: asyncio.Event):
-        """Coroutine to run the animation until finished or interrupted."""
-        # TODO: Is this extra task needed around sequence?
-        done = False
+    def _finish(self) -> None:
+        """Stop stepping and autoclear the notification if delay is 0."""
+        self._next_deadline = None
+        if self._clear_delay == 0 and self._hass and self._config_entry:
+            self._config_entry.async_create_background_task(
+                self._hass,
+                self._hass.services.async_call(
+                    Platform.SWITCH,
+                    SERVICE_TURN_OFF,
+                    service_data={ATTR_ENTITY_ID: self._notify_id},
+                ),
+                name="Animation autoclear",
+            )
 
-        # Read in the pattern and init
+    def run(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Start the animation from the beginning, due to step immediately."""
         self.reset()
+        self._hass = hass
+        self._config_entry = config_entry
+        self._next_deadline = hass.loop.time()
+
+    def step(self, now: float) -> bool:
+        """Advance the animation to its next delay, returning True when done."""
         try:
-            while not done and not stop_event.is_set():
-                self._step_finished.clear()
-                done = await self._sequence.runNextStep()
-                self._step_finished.set()
-                if not stop_event.is_set():  # Don't update if we were interrupted
-                    self._color = self._sequence.color
-        except Exception as e:
+            delay = self._sequence.advance()
+        except Exception:
             _LOGGER.exception("Failed running NotificationAnimation")
-        # Autoclear after animation if delay is 0
-        if self._clear_delay == 0:
-            await self._hass.services.async_call(
-                Platform.SWITCH,
-                SERVICE_TURN_OFF,
-                service_data={ATTR_ENTITY_ID: self._notify_id},
-            )
-
-    async def run(self, hass: HomeAssistant, config_entry: ConfigEntry):
-        if self._stop_event:
-            self._stop_event.set()
-        self._stop_event = asyncio.Event()
+            delay = None
         self._color = self._sequence.color
-        self._hass = hass
-        self._task = config_entry.async_create_background_task(
-            hass, self._worker_func(self._stop_event), name="Animation worker"
-        )
+        if delay is None:
+            self._finish()
+            return True
+        self._next_deadline = now + delay
+        return False
 
-    async def stop(self):
-        if self._stop_event:
-            self._stop_event.set()
+    def stop(self) -> None:
+        if self.is_running():
+            self._finish()
 
     def is_running(self) -> bool:
-        return bool(
-            self._task
-            and not self._task.done()
-            and self._stop_event
-            and not self._stop_event.is_set()
-        )
+        return self._next_deadline is not None
 
     @property
     def loops_forever(self) -> bool:
@@ -201,18 +224,7 @@ class _NotificationSequence:
         return self._clear_delay
 
 
-LIGHT_OFF_SEQUENCE = _NotificationSequence(
-    notify_id=STATE_OFF,
-    pattern=[ColorInfo(OFF_RGB, 0)],
-    priority=0,
-)
-LIGHT_ON_SEQUENCE = _NotificationSequence(
-    pattern=[ColorInfo(WARM_WHITE_RGB, 255)],
-    priority=DEFAULT_PRIORITY,
-)
-
-
-@dataclass
+@dataclass(slots=True)
 class _QueueEntry:
     action: str | None = None
     notify_id: str | None = None
@@ -240,7 +252,23 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
 
         self._running_sequences: dict[str, _NotificationSequence] = {}
         self._active_sequences: dict[str, _NotificationSequence] = {}
+        # Each light steps its own 'OFF' sequence, sequences hold run state
+        self._off_sequence = _NotificationSequence(
+            notify_id=STATE_OFF,
+            pattern=[shared_color_info(OFF_RGB, 0)],
+            priority=0,
+        )
+        # Sorted (-priority, insert order, notify_id) keys of _active_sequences
+        self._active_order: list[tuple[float, int, str]] = []
+        self._active_keys: dict[str, tuple[float, int, str]] = {}
+        self._order_counter = count()
         self._last_set_color: ColorInfo | None = None
+        self._last_command_time: float = 0.0
+        self._pending_command_canceler: Callable | None = None
+        # Persistent timer waking the loop for the next animation step
+        self._step_timer: asyncio.TimerHandle | None = None
+        # Deadline of the last step timer to fire, it may fire a tick early
+        self._fired_step_deadline: float = 0.0
         self._dynamic_priority: bool = self._config_entry.options.get(
             CONF_DYNAMIC_PRIORITY, True
         )
@@ -249,23 +277,28 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         )
         self._response_expected_expire_time: float = 0.0
 
-        self._task_queue: asyncio.Queue[_QueueEntry] = asyncio.Queue()
+        # Single consumer queue, the event is set whenever the loop should wake
+        self._task_queue: deque[_QueueEntry] = deque()
+        self._queue_event: asyncio.Event = asyncio.Event()
         self._task: asyncio.Task | None = None
 
         self._light_on_priority: int = config_entry.options.get(
             CONF_PRIORITY, DEFAULT_PRIORITY
         )
-        self._last_on_rgb: tuple = tuple(
-            config_entry.data.get(CONF_RGB_SELECTOR, WARM_WHITE_RGB)
+        rgb = config_entry.data.get(CONF_RGB_SELECTOR)
+        self._last_on_rgb: tuple[int, int, int] = (
+            tuple(rgb) if rgb is not None else WARM_WHITE_RGB
         )
         self._last_brightness: int = 255
+        # (rgb, attributes) derived for the last on color
+        self._cached_state_attrs: tuple[tuple, dict[str, Any]] | None = None
 
     async def async_added_to_hass(self):
         """Set up before initially adding to HASS."""
         await super().async_added_to_hass()
 
         # Add the 'OFF' sequence so the list isn't empty
-        self._active_sequences[STATE_OFF] = LIGHT_OFF_SEQUENCE
+        self._set_active_sequence(STATE_OFF, self._off_sequence)
 
         # Spawn the worker function background task to manage this bulb
         self._task = self._config_entry.async_create_background_task(
@@ -283,34 +316,42 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
                 self.hass, self._wrapped_entity_id, self._handle_wrapped_light_change
             )
         )
+        self._config_entry.async_on_unload(
+            async_track_entity_registry_updated_event(
+                self.hass, self._wrapped_entity_id, self._handle_wrapped_registry_update
+            )
+        )
 
         subs = self._config_entry.options.get(CONF_SUBSCRIPTION, {})
         pool_subs: list[str] = subs.get(TYPE_POOL, [])
         entity_subs: list[str] = subs.get(CONF_ENTITIES, [])
 
-        async def delay_fire_initial_events(_) -> None:
-            """Fire state change notifications for all subscribed events."""
+        @callback
+        def delay_fire_initial_events(_) -> None:
+            """Replay the current state of all subscribed notifications."""
             nonlocal pool_subs
             nonlocal entity_subs
             already_fired: set[str] = set()
             # Subscribe to the pool by adding _handle_notification_change to pool callbacks list
             for pool in pool_subs:
-                # Fire state_changed to get initial notification state
+                # Handle a synthesized state_changed to get initial notification state
                 for notif in HassData.get_all_entities(self.hass, pool).values():
                     if notif.entity_id in already_fired:
                         continue
                     already_fired.add(notif.entity_id)
-                    self.hass.bus.async_fire(
-                        "state_changed",
-                        {
-                            ATTR_ENTITY_ID: notif.entity_id,
-                            "new_state": self.hass.states.get(notif.entity_id),
-                            "old_state": None,
-                        },
+                    self._handle_notification_change(
+                        Event(
+                            EVENT_STATE_CHANGED,
+                            {
+                                ATTR_ENTITY_ID: notif.entity_id,
+                                "new_state": self.hass.states.get(notif.entity_id),
+                                "old_state": None,
+                            },
+                        )
                     )
 
             for entity in entity_subs:
-                # Fire state_changed to get initial notification state
+                # Handle a synthesized state_changed to get initial notification state
                 if entity in already_fired:
                     continue
                 already_fired.add(entity)
@@ -320,13 +361,15 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
                         "%s is missing notification %s", self.entity_id, entity
                     )
                     continue
-                self.hass.bus.async_fire(
-                    "state_changed",
-                    {
-                        ATTR_ENTITY_ID: entity,
-                        "new_state": new_state,
-                        "old_state": None,
-                    },
+                self._handle_notification_change(
+                    Event(
+                        EVENT_STATE_CHANGED,
+                        {
+                            ATTR_ENTITY_ID: entity,
+                            "new_state": new_state,
+                            "old_state": None,
+                        },
+                    )
                 )
 
         # Subscribe to the pool by adding _handle_notification_change to pool callbacks list
@@ -336,10 +379,11 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
             ).setdefault(CONF_SUBSCRIPTION, set())
             pool_callbacks.add(self._handle_notification_change)
 
-        for entity in entity_subs:
+        # One listener covers every subscribed entity
+        if entity_subs:
             self._config_entry.async_on_unload(
                 async_track_state_change_event(
-                    self.hass, entity, self._handle_notification_change
+                    self.hass, entity_subs, self._handle_notification_change
                 )
             )
 
@@ -362,6 +406,10 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         """Clean up before removal from HASS."""
         if self._task:
             self._task.cancel()
+        if self._pending_command_canceler:
+            self._pending_command_canceler()
+            self._pending_command_canceler = None
+        self._schedule_step_wake(None)
 
         # Unsubscribe any 'pool' subscriptions
 
@@ -374,35 +422,108 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
                 pool_callbacks.remove(self._handle_notification_change)
 
     @callback
-    def _get_sequence_step_events(self) -> set:
-        """Return awaitable events for the sequences on the current light."""
-        return {
-            anim.wait()
-            for anim in self._running_sequences.values()
-            if anim and anim.is_running()
-        }
+    def _get_next_deadline(self) -> float | None:
+        """Return the earliest step deadline of the running sequences."""
+        return min(
+            (
+                anim.next_deadline
+                for anim in self._running_sequences.values()
+                if anim and anim.next_deadline is not None
+            ),
+            default=None,
+        )
 
     @callback
-    def _sort_active_sequences(self) -> None:
-        self._active_sequences = dict(
-            sorted(
-                self._active_sequences.items(),
-                key=lambda item: -item[1].priority,
+    def _schedule_step_wake(self, deadline: float | None) -> None:
+        """Keep the step timer set to wake the loop at deadline."""
+        if (timer := self._step_timer) is not None:
+            if timer.when() == deadline:
+                return
+            timer.cancel()
+            self._step_timer = None
+        if deadline is not None:
+            self._step_timer = self.hass.loop.call_at(
+                deadline, self._step_timer_fired, deadline
             )
+
+    @callback
+    def _step_timer_fired(self, deadline: float) -> None:
+        """Wake the loop to run due animation steps."""
+        self._step_timer = None
+        self._fired_step_deadline = deadline
+        self._queue_event.set()
+
+    @callback
+    def _step_due_sequences(self) -> None:
+        """Advance every running sequence whose step deadline has passed."""
+        now = self.hass.loop.time()
+        # asyncio runs timers up to one clock tick early, always step the
+        # sequences the fired timer was armed for so it isn't re-armed in a spin
+        due = max(now, self._fired_step_deadline)
+        for anim in self._running_sequences.values():
+            if anim and anim.next_deadline is not None and anim.next_deadline <= due:
+                anim.step(now)
+
+    @callback
+    def _set_active_sequence(
+        self, notify_id: str, sequence: _NotificationSequence
+    ) -> None:
+        """Add or replace an active sequence."""
+        self._active_sequences[notify_id] = sequence
+        self._update_active_order(notify_id)
+
+    @callback
+    def _update_active_order(self, notify_id: str) -> None:
+        """(Re)insert an active sequence behind others of its current priority."""
+        self._remove_active_order(notify_id)
+        key = (
+            -self._active_sequences[notify_id].priority,
+            next(self._order_counter),
+            notify_id,
         )
+        self._active_keys[notify_id] = key
+        insort(self._active_order, key)
+
+    @callback
+    def _remove_active_order(self, notify_id: str) -> None:
+        if (key := self._active_keys.pop(notify_id, None)) is not None:
+            del self._active_order[bisect_left(self._active_order, key)]
+
+    @callback
+    def _pop_active_sequence(self, notify_id: str) -> _NotificationSequence | None:
+        """Remove an active sequence."""
+        self._remove_active_order(notify_id)
+        return self._active_sequences.pop(notify_id, None)
 
     @callback
     def _get_top_sequences(self) -> list[_NotificationSequence]:
         """Return the list of top priority active sequences."""
+        order = self._active_order
+        if not order:
+            return []
+        top_prio = order[0][0]
+        if len(order) == 1 or order[1][0] != top_prio:
+            # Common case, a single top sequence
+            return [self._active_sequences[order[0][2]]]
         ret: list[_NotificationSequence] = []
-        top_prio: int = 0
-        for sequence in self._active_sequences.values():
-            if sequence.priority < top_prio:
+        for neg_prio, _, notify_id in order:
+            if neg_prio != top_prio:
                 break
-            top_prio = sequence.priority
-            ret.append(sequence)
+            ret.append(self._active_sequences[notify_id])
         return ret
 
+    @callback
+    def _get_top_id(self) -> str | None:
+        """Return the active key of the first top priority sequence."""
+        return self._active_order[0][2] if self._active_order else None
+
+    @callback
+    def _get_top_sequence(self) -> _NotificationSequence | None:
+        """Return the first top priority active sequence."""
+        if not self._active_order:
+            return None
+        return self._active_sequences[self._active_order[0][2]]
+
     async def _process_sequence_list(self):
         """Process the sequence list for the current display color and set it on the bulb."""
         top_sequences: list[_NotificationSequence] = self._get_top_sequences()
@@ -416,7 +537,7 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
                     sequence.notify_id is not None
                     and sequence.notify_id not in self._running_sequences
                 ):
-                    await sequence.run(self.hass, self._config_entry)
+                    sequence.run(self.hass, self._config_entry)
                     self._running_sequences[sequence.notify_id] = sequence
 
             # Stop any sequences that are not top priority
@@ -430,7 +551,7 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
             # Stop animations that are lower priority than the current
             for seq_id, anim in remove_list.items():
                 if anim:
-                    await anim.stop()
+                    anim.stop()
                 self._running_sequences.pop(seq_id)
 
             # TODO: color mixing between active sequences? For now just show the top sequence.
@@ -442,7 +563,19 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
             # ]
             # color = NotificationLightEntity.mix_colors(colors)
             color = top_sequence.color
-            if color != self._last_set_color:
+            if not self._colors_match(color, self._last_set_color):
+                # Rate limit commands. Once the gap elapses the loop is woken
+                # and only the latest color is sent.
+                now = self.hass.loop.time()
+                remaining = self._last_command_time + MIN_COMMAND_INTERVAL_SEC - now
+                if remaining > 0:
+                    if self._pending_command_canceler is None:
+                        self._pending_command_canceler = async_call_later(
+                            self.hass, remaining, self._send_pending_command
+                        )
+                    return
+
+                self._last_command_time = now
                 if await self._wrapped_light_turn_on(**color.light_params):
                     self._last_set_color = color
                 else:
@@ -455,6 +588,17 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         else:
             _LOGGER.error("Sequence list empty for %s", self.name)
 
+    @callback
+    def _send_pending_command(self, _: Any) -> None:
+        """Wake the loop to send a color that was held back by the rate limit."""
+        self._pending_command_canceler = None
+        self._wake_loop()
+
+    @staticmethod
+    def _colors_match(color: ColorInfo, last: ColorInfo | None) -> bool:
+        """Return True if color is what the light was last set to."""
+        return last is not None and color.rgb == last.rgb
+
     async def _worker_func(self):
         """Try/Except wrapper around inner work loop."""
         while True:
@@ -469,7 +613,6 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         """Worker loop to manage light."""
         # Wait until the list is not empty
         entry_data = self._config_entry.data
-        q_task: asyncio.Task | None = None
         cycle_canceler: Callable | None = None
         cycle_delay_time = entry_data.get(CONF_DELAY_TIME)
         cycle_delay_enabled = entry_data.get(CONF_DELAY, False)
@@ -496,42 +639,38 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
                 and len(self._running_sequences) > 1
             ):
 
-                async def queue_cycle(_):
+                @callback
+                def queue_cycle(_):
                     nonlocal cycle_canceler
                     cycle_canceler = None
                     if len(self._running_sequences) > 1:
-                        await self._task_queue.put(_QueueEntry(ACTION_CYCLE_SAME))
+                        self._queue_entry(_QueueEntry(ACTION_CYCLE_SAME))
 
                 cycle_canceler = async_call_later(self.hass, cycle_delay, queue_cycle)
 
             # Now wait for a command or for an animation step
-            if q_task is None or q_task.done():
-                q_task = asyncio.create_task(self._task_queue.get())
-            wait_tasks = [
-                asyncio.create_task(x) for x in self._get_sequence_step_events()
-            ]
-            wait_tasks.append(q_task)
-            done, pending = await asyncio.wait(
-                wait_tasks,
-                return_when=asyncio.FIRST_COMPLETED,
-            )
-            if q_task in done:
-                item: _QueueEntry = await q_task
+            self._schedule_step_wake(self._get_next_deadline())
+            await self._queue_event.wait()
+            self._queue_event.clear()
+            self._step_due_sequences()
+            while self._task_queue:
+                item: _QueueEntry = self._task_queue.popleft()
                 _LOGGER.info(
                     "[%s] Got queue item: [%s]", self._config_entry.title, item
                 )
                 if item.action == CONF_DELETE:
                     if item.notify_id in self._active_sequences:
-                        anim = self._active_sequences.pop(item.notify_id)
+                        anim = self._pop_active_sequence(item.notify_id)
                         if item.notify_id in self._running_sequences:
-                            await anim.stop()
+                            anim.stop()
                             self._running_sequences.pop(item.notify_id)
 
                 if item.action == CONF_ADD and item.sequence:
                     if item.notify_id in self._active_sequences:
                         _LOGGER.warning("%s already in active list", item.notify_id)
 
-                    async def restore_priority(
+                    @callback
+                    def restore_priority(
                         _,
                         priority=item.sequence.priority,
                         notify_id=item.notify_id,
@@ -545,8 +684,8 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
                                 notify_id,
                                 sequence.priority,
                             )
-                            self._sort_active_sequences()
-                            await self._wake_loop()
+                            self._update_active_order(notify_id)
+                            self._wake_loop()
 
                     # Temporarily give high priority for peeks
                     if (
@@ -569,24 +708,13 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
                             async_call_later(self.hass, peek_duration, restore_priority)
 
                     # Add the new sequence in, sorted by priority
-                    self._active_sequences[item.notify_id] = item.sequence
-                    self._sort_active_sequences()
-
-                if item.action == ACTION_CYCLE_SAME and self._active_sequences:
-                    # Copy the top-priority items in the sequence list.
-                    it = iter(self._active_sequences.items())
-                    new_dict = {}
-                    top_id, top_seq = next(it)
-                    if top_id != STATE_OFF:
-                        top_prio = top_seq.priority
-                        for it_id, it_seq in it:
-                            if top_prio > it_seq.priority:
-                                new_dict[top_id] = top_seq
-                                top_prio = -1
-                            new_dict[it_id] = it_seq
-                        self._active_sequences = new_dict
-
-                self._task_queue.task_done()
+                    self._set_active_sequence(item.notify_id, item.sequence)
+
+                if item.action == ACTION_CYCLE_SAME:
+                    # Move the top sequence behind others of the same priority
+                    top_id = self._get_top_id()
+                    if top_id is not None and top_id != STATE_OFF:
+                        self._update_active_order(top_id)
 
     @callback
     @staticmethod
@@ -595,64 +723,72 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
     ) -> ColorInfo:
         """Mix a list of RGB colors with their respective brightness and weight values."""
         if weights is None:
-            weights = [1.0] * len(colors)
-
-        # Normalize the weights so they sum to 1
-        total_weight = sum(weights)
-        normalized_weights = [w / total_weight for w in weights]
+            # Equal weights, so skip building a weight list
+            pairs = ((color, 1.0) for color in colors)
+            total_weight = float(len(colors))
+        else:
+            pairs = zip(colors, weights, strict=True)
+            total_weight = sum(weights)
 
         # Initialize accumulators for the weighted RGB values
-        r_total, g_total, b_total, brightness_total = 0.0, 0.0, 0.0, 0.0
+        r_total = g_total = b_total = brightness_total = 0.0
 
-        # Calculate the weighted average of RGB channels
-        for color, weight in zip(colors, normalized_weights, strict=True):
+        # Calculate the weighted sum of RGB channels
+        for color, weight in pairs:
             r, g, b = color.rgb
-            # Apply brightness scaling to each color
             r_total += r * weight
             g_total += g * weight
             b_total += b * weight
             brightness_total += color.brightness * weight
 
-        # Ensure RGB values are within the valid range [0, 255]
-        r = min(int(round(r_total)), 255)
-        g = min(int(round(g_total)), 255)
-        b = min(int(round(b_total)), 255)
-        brightness_total = min(int(round(brightness_total)), 255)
+        # Normalize once so the weights effectively sum to 1, and ensure RGB
+        # values are within the valid range [0, 255]
+        scale = 1.0 / total_weight
+        r = min(int(round(r_total * scale)), 255)
+        g = min(int(round(g_total * scale)), 255)
+        b = min(int(round(b_total * scale)), 255)
+        brightness_total = min(int(round(brightness_total * scale)), 255)
 
         return ColorInfo((r, g, b), brightness_total)
 
-    async def _wake_loop(self) -> None:
+    @callback
+    def _wake_loop(self) -> None:
         """Wake the event loop to process light sequences."""
-        await self._task_queue.put(_QueueEntry(action=None, notify_id=None))
+        self._queue_event.set()
 
-    async def _add_sequence(
-        self, notify_id: str, sequence: _NotificationSequence
-    ) -> None:
+    @callback
+    def _queue_entry(self, entry: _QueueEntry) -> None:
+        """Queue an entry for the event loop and wake it."""
+        self._task_queue.append(entry)
+        self._queue_event.set()
+
+    @callback
+    def _add_sequence(self, notify_id: str, sequence: _NotificationSequence) -> None:
         """Add a sequence to this light."""
-        await self._task_queue.put(
+        self._queue_entry(
             _QueueEntry(action=CONF_ADD, notify_id=notify_id, sequence=sequence)
         )
 
-    async def _remove_sequence(self, notify_id: str) -> None:
+    @callback
+    def _remove_sequence(self, notify_id: str) -> None:
         """Remove a sequence from this light."""
-        await self._task_queue.put(_QueueEntry(notify_id=notify_id, action=CONF_DELETE))
+        self._queue_entry(_QueueEntry(notify_id=notify_id, action=CONF_DELETE))
 
     async def _reset_running_sequences(self) -> None:
         """Immediately reset the running sequence list"""
         while self._running_sequences:
             seq_id, anim = self._running_sequences.popitem()
-            await anim.stop()
+            anim.stop()
         self._last_set_color = None
-        await self._wake_loop()
+        self._wake_loop()
 
     def _reset_expected_response_timeout(self):
         self._response_expected_expire_time = (
-            time.time() + EXPECTED_SERVICE_CALL_TIMEOUT
+            self.hass.loop.time() + EXPECTED_SERVICE_CALL_TIMEOUT
         )
 
-    async def _handle_notification_change(
-        self, event: Event[EventStateChangedData]
-    ) -> None:
+    @callback
+    def _handle_notification_change(self, event: Event[EventStateChangedData]) -> None:
         """Handle a subscribed notification changing state."""
         notify_id = event.data[CONF_ENTITY_ID]
         if event.data.get("new_state") is None:
@@ -661,7 +797,7 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
                 self._config_entry.title,
                 notify_id,
             )
-            await self._remove_sequence(notify_id)
+            self._remove_sequence(notify_id)
             return
 
         is_on = event.data["new_state"].state == STATE_ON
@@ -669,9 +805,9 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
             sequence = self._create_sequence_from_attr(
                 event.data["new_state"].attributes, notify_id
             )
-            await self._add_sequence(notify_id, sequence)
+            self._add_sequence(notify_id, sequence)
         else:
-            await self._remove_sequence(notify_id)
+            self._remove_sequence(notify_id)
 
     async def _handle_wrapped_light_change(
         self, event: Event[EventStateChangedData]
@@ -679,7 +815,7 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         """Handle the underlying wrapped light changing state."""
         if event.data["old_state"] is None:
             await self._handle_wrapped_light_init()
-        elif time.time() > self._response_expected_expire_time:
+        elif self.hass.loop.time() > self._response_expected_expire_time:
             _LOGGER.warning(
                 "%s received unexpected event %s", self.entity_id, str(event.data)
             )
@@ -688,18 +824,41 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
 
     async def _handle_wrapped_light_init(self) -> None:
         """Handle wrapped light entity initializing."""
+        # Capabilities are kept up to date by registry events once loaded
+        if self._wrapped_init_done or self._load_wrapped_capabilities():
+            self._wrapped_init_done = True
+            self.async_write_ha_state()
+            self._wake_loop()
+
+    @callback
+    def _load_wrapped_capabilities(self) -> bool:
+        """Read the wrapped light's capabilities from the entity registry."""
         entity_registry: er.EntityRegistry = er.async_get(self.hass)
         entity: er.RegistryEntry | None = entity_registry.async_get(
             self._wrapped_entity_id
         )
-        if entity:
-            self._attr_capability_attributes = dict(entity.capabilities)
-            self._attr_supported_color_modes = self._attr_capability_attributes.get(
-                "supported_color_modes", set()
-            )
-            self._wrapped_init_done = True
+        if entity is None:
+            return False
+        # Read-only view, the registry entry's capabilities are never mutated
+        capabilities = MappingProxyType(entity.capabilities or {})
+        self._attr_capability_attributes = capabilities
+        self._attr_supported_color_modes = capabilities.get(
+            "supported_color_modes", set()
+        )
+        return True
+
+    @callback
+    def _handle_wrapped_registry_update(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Reload the wrapped light's capabilities when its registry entry changes."""
+        action = event.data["action"]
+        if action == "remove" or (
+            action == "update" and "capabilities" not in event.data["changes"]
+        ):
+            return
+        if self._load_wrapped_capabilities() and self._wrapped_init_done:
             self.async_write_ha_state()
-            await self._wake_loop()
 
     async def _wrapped_light_turn_on(self, **kwargs: Any) -> bool:
         """Turn on the underlying wrapped light entity."""
@@ -723,18 +882,17 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
             # We want low RGB values to be dim, but HomeAssistant needs a separate brightness value for that.
             # TODO: Do we actually want this?
             # If brightness was not passed in and bulb doesn't support RGB then convert to HS + Brightness.
-            rgb = kwargs.pop(ATTR_RGB_COLOR)
-            h, s, v = color_RGB_to_hsv(*rgb)
-            # Re-scale 'v' from 0-100 to 0-255
-            brightness = (255 / 100) * v
-            kwargs[ATTR_HS_COLOR] = (h, s)
+            hs_color, brightness = _rgb_to_hs_and_brightness(
+                tuple(kwargs.pop(ATTR_RGB_COLOR))
+            )
+            kwargs[ATTR_HS_COLOR] = hs_color
             kwargs[ATTR_BRIGHTNESS] = brightness
 
         self._reset_expected_response_timeout()
+        # kwargs is already a fresh dict, so add the target instead of merging
+        kwargs[ATTR_ENTITY_ID] = self._wrapped_entity_id
         await self.hass.services.async_call(
-            Platform.LIGHT,
-            SERVICE_TURN_ON,
-            service_data={ATTR_ENTITY_ID: self._wrapped_entity_id} | kwargs,
+            Platform.LIGHT, SERVICE_TURN_ON, service_data=kwargs
         )
         return True
 
@@ -743,10 +901,10 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         if not self._wrapped_init_done:
             return False
         self._reset_expected_response_timeout()
+        # kwargs is already a fresh dict, so add the target instead of merging
+        kwargs[ATTR_ENTITY_ID] = self._wrapped_entity_id
         await self.hass.services.async_call(
-            Platform.LIGHT,
-            SERVICE_TURN_OFF,
-            service_data={ATTR_ENTITY_ID: self._wrapped_entity_id} | kwargs,
+            Platform.LIGHT, SERVICE_TURN_OFF, service_data=kwargs
         )
         return True
 
@@ -755,7 +913,7 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         r: float, g: float, b: float
     ) -> tuple[float, float, float]:
         """Return RGB to HS plus brightness."""
-        h, s, v = color_RGB_to_hsv(r, g, b)
+        h, s, v = _rgb_to_hsv(r, g, b)
         # Re-scale 'v' from 0-100 to 0-255
         v = round((255 / 100) * v)
         return (h, s, v)
@@ -766,7 +924,8 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         """Create a light NotifySequence from a notification attributes."""
         pattern = attributes.get(CONF_NOTIFY_PATTERN)
         if not pattern:
-            pattern = [ColorInfo(rgb=attributes.get(CONF_RGB_SELECTOR, WARM_WHITE_RGB))]
+            rgb = attributes.get(CONF_RGB_SELECTOR, WARM_WHITE_RGB)
+            pattern = [shared_color_info(tuple(rgb))]
         expire_enabled = attributes.get(CONF_EXPIRE_ENABLED, False)
         expire_time = attributes.get(CONF_DELAY_TIME) if expire_enabled else None
         delay_sec: float | None = (
@@ -786,67 +945,77 @@ class NotificationLightEntity(LightEntity, RestoreEntity):
         self._attr_is_on = True
 
         if ATTR_HS_COLOR in kwargs:
-            rgb = color_hs_to_RGB(*kwargs[ATTR_HS_COLOR])
+            rgb = _hs_to_rgb(*kwargs[ATTR_HS_COLOR])
         elif ATTR_COLOR_TEMP_KELVIN in kwargs:
-            rgb = color_temperature_to_rgb(kwargs[ATTR_COLOR_TEMP_KELVIN])
+            rgb = _temperature_to_rgb(kwargs[ATTR_COLOR_TEMP_KELVIN])
         elif ATTR_RGB_COLOR in kwargs or ATTR_BRIGHTNESS in kwargs:
             rgb = kwargs.get(ATTR_RGB_COLOR, self._last_on_rgb)
             self._last_brightness = kwargs.get(ATTR_BRIGHTNESS, self._last_brightness)
             v = (100 / 255) * self._last_brightness
-            h, s, _ = color_RGB_to_hsv(*rgb)
-            rgb = color_hsv_to_RGB(h, s, v)
+            h, s, _ = _rgb_to_hsv(*rgb)
+            rgb = _hsv_to_rgb(h, s, v)
         else:
             rgb = self._last_on_rgb
 
         priority = self._light_on_priority
         if self._dynamic_priority:
             # Dynamic priority gets 0.5 boost of top priority to ensure light-on always shows.
-            priority = max(priority, self._get_top_sequences()[0].priority) + 0.5
+            if (top_sequence := self._get_top_sequence()) is not None:
+                priority = max(priority, top_sequence.priority)
+            priority += 0.5
 
         self._last_on_rgb = rgb
-        sequence = replace(
-            LIGHT_ON_SEQUENCE, pattern=[ColorInfo(rgb=rgb)], priority=priority
+        sequence = _NotificationSequence(
+            pattern=[shared_color_info(tuple(rgb))], priority=priority
         )
 
-        await self._add_sequence(STATE_ON, sequence)
+        self._add_sequence(STATE_ON, sequence)
         self.async_write_ha_state()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Handle a turn_off service call."""
         self._attr_is_on = False
         self.async_write_ha_state()
-        await self._remove_sequence(STATE_ON)
+        self._remove_sequence(STATE_ON)
 
     async def async_toggle(self, **kwargs: Any) -> None:
         """Handle a toggle service call."""
         # Turn 'on' the light if it is off, or if dynamic priority is enabled and 'on' isn't top.
         if not self.is_on or (
-            self._dynamic_priority and self._get_top_sequence().notify_id != STATE_ON
+            self._dynamic_priority and self._get_top_id() != STATE_ON
         ):
             await self.async_turn_on(**kwargs)
         else:
             await self.async_turn_off(**kwargs)
 
     @property
-    def capability_attributes(self) -> dict[str, Any] | None:
+    def capability_attributes(self) -> Mapping[str, Any] | None:
         """Return the capability attributes of the underlying light entity."""
         return self._attr_capability_attributes
 
     @property
     def state_attributes(self) -> dict[str, Any]:
         """Return the state attributes."""
-        data: dict[str, Any] = {}
-        if self.is_on:
-            data[ATTR_COLOR_MODE] = ColorMode.RGB
-            data[ATTR_RGB_COLOR] = self._last_on_rgb
-            h, s, v = color_RGB_to_hsv(*self._last_on_rgb)
-            brightness = (255 / 100) * v  # Re-scale 'v' from 0-100 to 0-255
-            data[ATTR_BRIGHTNESS] = brightness
-            data[ATTR_COLOR_TEMP_KELVIN] = color_temperature_to_rgb
-            x, y = color_hs_to_xy(h, s)
-            data[ATTR_XY_COLOR] = (x, y)
-            data[ATTR_COLOR_TEMP_KELVIN] = color_xy_to_temperature(x, y)
-        return data
+        if not self.is_on:
+            return {}
+        rgb = self._last_on_rgb
+        cached = self._cached_state_attrs
+        if cached is None or cached[0] != rgb:
+            # Only recompute the conversions when the on color changes
+            h, s, v = _rgb_to_hsv(*rgb)
+            x, y = _hs_to_xy(h, s)
+            cached = self._cached_state_attrs = (
+                rgb,
+                {
+                    ATTR_COLOR_MODE: ColorMode.RGB,
+                    ATTR_RGB_COLOR: rgb,
+                    # Re-scale 'v' from 0-100 to 0-255
+                    ATTR_BRIGHTNESS: (255 / 100) * v,
+                    ATTR_XY_COLOR: (x, y),
+                    ATTR_COLOR_TEMP_KELVIN: _xy_to_temperature(x, y),
+                },
+            )
+        return cached[1]
 
     @property
     def color_mode(self) -> ColorMode | str | None:
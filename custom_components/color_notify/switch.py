@@ -135,7 +135,7 @@ async def forward_pooled_update(
     )
     for sub in subs:
         if callable(sub):
-            await sub(event)
+            sub(event)
 
     if new_state is None:
         # Entity was renamed or deleted so resubscribe
@@ -1,7 +1,8 @@
+from dataclasses import dataclass
 import logging
 from typing import Any
 
-from homeassistant.const import CONF_ENTITY_ID, CONF_TYPE, CONF_UNIQUE_ID
+from homeassistant.const import CONF_ENTITY_ID, CONF_TYPE, CONF_UNIQUE_ID, Platform
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er
 
@@ -10,6 +11,14 @@ from ..const import DOMAIN, TYPE_LIGHT, TYPE_POOL, CONF_ENTRY
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class EntityRecord:
+    """Lightweight view of an entity registry entry."""
+
+    unique_id: str
+    entity_id: str
+
+
 class HassData:
     """Helper functions for access hass_data."""
 
@@ -39,11 +48,29 @@ class HassData:
     @staticmethod
     def get_all_entities(
         hass: HomeAssistant, config_entry_id: str
-    ) -> dict[str, er.RegistryEntry]:
+    ) -> dict[str, EntityRecord]:
         """Return all entities from a given config_entry."""
         entity_registry = er.async_get(hass)
         entities = er.async_entries_for_config_entry(entity_registry, config_entry_id)
-        return {entity.unique_id: entity for entity in entities}
+        return {
+            entity.unique_id: EntityRecord(entity.unique_id, entity.entity_id)
+            for entity in entities
+        }
+
+    @callback
+    @staticmethod
+    def get_entity(
+        hass: HomeAssistant, config_entry_id: str, unique_id: str
+    ) -> EntityRecord | None:
+        """Return a notification switch from a given config_entry by unique id."""
+        entity_registry = er.async_get(hass)
+        entity_id = entity_registry.async_get_entity_id(
+            Platform.SWITCH, DOMAIN, unique_id
+        )
+        entity = entity_registry.async_get(entity_id) if entity_id else None
+        if entity is None or entity.config_entry_id != config_entry_id:
+            return None
+        return EntityRecord(entity.unique_id, entity.entity_id)
 
     @callback
     @staticmethod
@@ -91,8 +118,7 @@ class HassData:
         hass: HomeAssistant, config_entry_id: str, unique_id: str
     ) -> None:
         """Remove an entity by unique id."""
-        entities = HassData.get_all_entities(hass, config_entry_id)
-        entity_to_delete = entities.get(unique_id)
+        entity_to_delete = HassData.get_entity(hass, config_entry_id, unique_id)
         if entity_to_delete is not None:
             entity_registry = er.async_get(hass)
             entity_registry.async_remove(entity_to_delete.entity_id)
@@ -3,63 +3,113 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-import asyncio
-from copy import copy
-from dataclasses import dataclass, field, replace
-import json
+from dataclasses import dataclass, field
+from functools import lru_cache
 import logging
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from homeassistant.components.light import ATTR_RGB_COLOR
 from homeassistant.const import CONF_DELAY, CONF_RGB
 
 from ..const import OFF_RGB, WARM_WHITE_RGB
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 _LOGGER = logging.getLogger(__name__)
 
 
 def _interpolate(start: tuple, end: tuple, amount: float) -> tuple:
-    return tuple(
-        int(t1 + (t2 - t1) * amount) for t1, t2 in zip(start, end, strict=True)
+    r1, g1, b1 = start
+    r2, g2, b2 = end
+    return (
+        int(r1 + (r2 - r1) * amount),
+        int(g1 + (g2 - g1) * amount),
+        int(b1 + (b2 - b1) * amount),
     )
 
 
-@dataclass
+@lru_cache(maxsize=512)
+def _build_light_params(rgb: tuple) -> Mapping[str, Any]:
+    """Return the (shared, read-only) light.turn_on params for a color."""
+    return MappingProxyType({ATTR_RGB_COLOR: rgb})
+
+
+@dataclass(frozen=True, slots=True)
 class ColorInfo:
     """Internal color representation."""
 
     rgb: tuple = WARM_WHITE_RGB
     brightness: float = 100.0
 
+    def __post_init__(self) -> None:
+        # Patterns and config store rgb as lists, keep it hashable
+        if not isinstance(self.rgb, tuple):
+            object.__setattr__(self, "rgb", tuple(self.rgb))
+
     def interpolated_to(self, end: ColorInfo, amount: float) -> ColorInfo:
         """Return a new ColorInfo that is 0-1.0 linearly interpolated between end."""
-        a = (*self.rgb, self.brightness)
-        b = (*end.rgb, end.brightness)
-        return ColorInfo(*_interpolate(a, b, amount))
+        return ColorInfo(
+            _interpolate(self.rgb, end.rgb, amount),
+            self.brightness + (end.brightness - self.brightness) * amount,
+        )
 
     @property
-    def light_params(self) -> dict[str, Any]:
-        """Return dict suitable for passing to light.turn_on service."""
-        return {ATTR_RGB_COLOR: self.rgb}
+    def light_params(self) -> Mapping[str, Any]:
+        """Return mapping suitable for passing to light.turn_on service."""
+        return _build_light_params(self.rgb)
+
+
+@lru_cache(maxsize=128)
+def shared_color_info(rgb: tuple, brightness: float = 100.0) -> ColorInfo:
+    """Return a shared ColorInfo, so repeated colors reuse one frozen instance."""
+    return ColorInfo(rgb, brightness)
 
 
 class LightSequence:
     """Handle cycling through sequences of colors."""
 
+    __slots__ = (
+        "_steps",
+        "_workspace",
+        "_initial_color",
+        "_loops_forever",
+        "_num_loops",
+    )
+
     def __init__(self) -> None:
         """Initialize a new LightSequence."""
         self._steps: list[_SeqStep] = []
         self._workspace: _SeqWorkspace = _SeqWorkspace()
+        self._initial_color: ColorInfo = shared_color_info(OFF_RGB, 0)
         self._loops_forever: bool = False
-
-    async def runNextStep(self) -> bool:
-        """Run the next step, returning 'True' if done."""
-        if self._workspace.next_idx >= len(self._steps):
-            return True
-        next_step = self._steps[self._workspace.next_idx]
-        self._workspace.next_idx += 1
-        await next_step.execute(self._workspace)
-        return self._workspace.next_idx >= len(self._steps)
+        self._num_loops: int = 0
+
+    def advance(self) -> float | None:
+        """Run steps up to the next delay, returning it or None once finished."""
+        workspace = self._workspace
+        steps = self._steps
+        num_steps = len(steps)
+        while workspace.next_idx < num_steps:
+            step = steps[workspace.next_idx]
+            workspace.next_idx += 1
+            step.execute(workspace)
+            if (delay := workspace.delay) is not None:
+                workspace.delay = None
+                return delay
+        return None
+
+    def rewind(self) -> None:
+        """Rewind this sequence to its first step without re-parsing."""
+        workspace = self._workspace
+        workspace.next_idx = 0
+        workspace.cur_loop = 0
+        workspace.loop_counts = [0] * self._num_loops
+        workspace.delay = None
+        workspace.color = self._initial_color
 
     def _addStep(self, step: _SeqStep) -> None:
         """Add a new step to this LightSequence."""
@@ -69,10 +119,29 @@ class LightSequence:
     @staticmethod
     def create_from_pattern(pattern: list[str | ColorInfo]) -> LightSequence:
         """Create a LightSequence from a supplied pattern."""
+        # Steps are stateless, so sequences from the same pattern share them
+        pattern_key = tuple(pattern)
+        try:
+            compiled = _compile_pattern(pattern_key)
+        except TypeError:
+            # Unhashable entries can't key the cache, parse them directly
+            compiled = LightSequence._parse_pattern(pattern_key)
+        new_sequence: LightSequence = LightSequence()
+        new_sequence._steps = compiled._steps
+        new_sequence._initial_color = compiled._initial_color
+        new_sequence._loops_forever = compiled._loops_forever
+        new_sequence._num_loops = compiled._num_loops
+        new_sequence._workspace.color = compiled._initial_color
+        new_sequence._workspace.loop_counts = [0] * compiled._num_loops
+        return new_sequence
+
+    @staticmethod
+    def _parse_pattern(pattern: tuple[str | ColorInfo, ...]) -> LightSequence:
+        """Parse a supplied pattern into a new LightSequence."""
         new_sequence: LightSequence = LightSequence()
         initial_color: ColorInfo | None = None
-        next_loop_id: int = 1
-        loop_stack: list[int] = []
+        # (loop index, step index the loop jumps back to) of each open loop
+        loop_stack: list[tuple[int, int]] = []
         for idx, item in enumerate(pattern):
             if isinstance(item, ColorInfo):
                 if initial_color is None:
@@ -81,9 +150,10 @@ class LightSequence:
             elif isinstance(item, str):
                 item = item.strip()
                 if item == "[":
-                    new_sequence._addStep(_StepOpenLoop(next_loop_id))
-                    loop_stack.append(next_loop_id)
-                    next_loop_id += 1
+                    loop_stack.append(
+                        (new_sequence._num_loops, len(new_sequence._steps))
+                    )
+                    new_sequence._num_loops += 1
                 elif item.startswith("]"):
                     with_iter_cnt = item.split(",")
                     if len(with_iter_cnt) == 2:
@@ -97,29 +167,43 @@ class LightSequence:
                         raise Exception(
                             f"Loop close in entry #{idx+1} with no open loop!"
                         )
-                    loop_id = loop_stack.pop()
-                    new_sequence._addStep(_StepCloseLoop(loop_id, iter_cnt))
+                    loop_idx, open_idx = loop_stack.pop()
+                    new_sequence._addStep(_StepCloseLoop(loop_idx, open_idx, iter_cnt))
                 else:
                     try:
-                        json_txt = f"{{{item.strip().strip('{}')}}}"  # Strip and re-add curly braces
-                        item_dict = json.loads(json_txt)
+                        json_txt = f"{{{item.strip('{}')}}}"  # Strip and re-add curly braces
+                        item_dict = _json_loads(json_txt)
                         rgb = item_dict.get(ATTR_RGB_COLOR, item_dict[CONF_RGB])
+                        color = shared_color_info(tuple(rgb))
                     except Exception as e:
                         raise Exception(f"Error in entry #{idx+1}: {str(e)}")
-                    color = ColorInfo(rgb=rgb)
                     if initial_color is None:
                         initial_color = color
                     # TODO: Fade
                     new_sequence._addStep(_StepSetColor(color))
                     if delay := item_dict.get(CONF_DELAY):
                         new_sequence._addStep(_StepDelay(delay))
-        new_sequence._workspace.color = initial_color or ColorInfo(OFF_RGB, 0)
+        if initial_color is not None:
+            new_sequence._initial_color = initial_color
+        new_sequence._workspace.color = new_sequence._initial_color
         if len(loop_stack) > 0:
             raise Exception(
-                f"The loop opened at entry #{loop_stack[0]} was not closed!"
+                f"The loop opened at entry #{loop_stack[0][0] + 1} was not closed!"
             )
         return new_sequence
 
+    @staticmethod
+    def validate_pattern(pattern: list[str]) -> None:
+        """Raise if the supplied pattern can't be parsed."""
+        pattern_key = tuple(pattern)
+        try:
+            error = _validate_pattern_cached(pattern_key)
+        except TypeError:
+            # Unhashable entries can't key the cache, validate without it
+            error = _validate_pattern(pattern_key)
+        if error:
+            raise Exception(error)
+
     @property
     def loops_forever(self) -> bool:
         """Return True if this sequence loops forever."""
@@ -128,7 +212,7 @@ class LightSequence:
     @property
     def color(self) -> ColorInfo:
         """Return this sequence's current color."""
-        return copy(self._workspace.color)
+        return self._workspace.color  # Frozen, safe to share
 
     @color.setter
     def color(self, value: ColorInfo) -> None:
@@ -136,12 +220,25 @@ class LightSequence:
         self._workspace.color = value
 
 
-@dataclass
-class _LoopInfo:
-    """Information to store per-loop in a sequence."""
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: tuple[str | ColorInfo, ...]) -> LightSequence:
+    """Return the parsed sequence for a pattern, shared by all its users."""
+    return LightSequence._parse_pattern(pattern)
+
+
+def _validate_pattern(pattern: tuple[str, ...]) -> str | None:
+    """Return the parse error for a pattern, or None if it is valid."""
+    try:
+        LightSequence.create_from_pattern(list(pattern))
+    except Exception as e:
+        return str(e)
+    return None
 
-    open_idx: int = 0
-    loop_cnt: int = 0
+
+@lru_cache(maxsize=256)
+def _validate_pattern_cached(pattern: tuple[str, ...]) -> str | None:
+    """Return the cached parse error for a hashable pattern."""
+    return _validate_pattern(pattern)
 
 
 @dataclass
@@ -150,8 +247,9 @@ class _SeqWorkspace:
 
     next_idx: int = 0
     cur_loop: int = 0
-    data: dict[Any, Any] = field(default_factory=dict)
+    loop_counts: list[int] = field(default_factory=list)  # Indexed by loop
     color: ColorInfo = field(default_factory=ColorInfo)
+    delay: float | None = None  # Set by a delay step, consumed by advance()
 
 
 class _SeqStep(ABC):
@@ -161,7 +259,7 @@ class _SeqStep(ABC):
         self._idx: int | None = None  # This step's index within the sequence
 
     @abstractmethod
-    async def execute(self, workspace: _SeqWorkspace):
+    def execute(self, workspace: _SeqWorkspace):
         """Perform this steps action to update the workspace."""
 
     @property
@@ -173,36 +271,24 @@ class _SeqStep(ABC):
         self._idx = value
 
 
-class _StepOpenLoop(_SeqStep):
-    """Sequence step that opens a loop."""
-
-    def __init__(self, loop_id: int) -> None:
-        super().__init__()
-        self._loop_id = loop_id
-
-    async def execute(self, workspace: _SeqWorkspace):
-        assert self.idx is not None
-        if self._loop_id not in workspace.data:
-            workspace.data[self._loop_id] = _LoopInfo(open_idx=self.idx)
-
-
 class _StepCloseLoop(_SeqStep):
     """Sequence step that closes a loop."""
 
-    def __init__(self, loop_id: int, loop_cnt: int) -> None:
+    def __init__(self, loop_idx: int, open_idx: int, loop_cnt: int) -> None:
         super().__init__()
-        self._loop_id = loop_id
+        self._loop_idx = loop_idx
+        self._open_idx = open_idx
         self._total_repeats = loop_cnt
 
-    async def execute(self, workspace: _SeqWorkspace):
-        info: _LoopInfo | None = workspace.data.get(self._loop_id)
-        if info is None:
-            raise ValueError("CloseLoop with no matching OpenLoop!")
-        info.loop_cnt += 1
-        if self._total_repeats < 0 or info.loop_cnt <= self._total_repeats:
-            workspace.next_idx = info.open_idx
+    def execute(self, workspace: _SeqWorkspace):
+        loop_counts = workspace.loop_counts
+        loop_cnt = loop_counts[self._loop_idx] + 1
+        if self._total_repeats < 0 or loop_cnt <= self._total_repeats:
+            loop_counts[self._loop_idx] = loop_cnt
+            workspace.next_idx = self._open_idx
         else:
-            workspace.data.pop(self._loop_id)
+            # Reset so the loop runs again if an outer loop re-enters it
+            loop_counts[self._loop_idx] = 0
 
 
 class _StepSetColor(_SeqStep):
@@ -212,8 +298,8 @@ class _StepSetColor(_SeqStep):
         super().__init__()
         self._color: ColorInfo = color
 
-    async def execute(self, workspace: _SeqWorkspace):
-        workspace.color = replace(self._color)  # creates a copy
+    def execute(self, workspace: _SeqWorkspace):
+        workspace.color = self._color  # Frozen, safe to share
 
 
 class _StepDelay(_SeqStep):
@@ -223,5 +309,5 @@ class _StepDelay(_SeqStep):
         super().__init__()
         self._delay = delay
 
-    async def execute(self, workspace: _SeqWorkspace):
-        await asyncio.sleep(self._delay)
+    def execute(self, workspace: _SeqWorkspace):
+        workspace.delay = self._delay
@@ -26,9 +26,29 @@ HA_MODULES = [
     "voluptuous",
 ]
 
+
+def _stub_module(name: str) -> types.ModuleType:
+    """Return a module whose unset attributes are created as MagicMocks on use."""
+    module = types.ModuleType(name)
+
+    def __getattr__(attr: str):
+        if attr.startswith("__"):
+            raise AttributeError(attr)
+        value = MagicMock(name=f"{name}.{attr}")
+        setattr(module, attr, value)
+        return value
+
+    module.__getattr__ = __getattr__
+    return module
+
+
 for mod_name in HA_MODULES:
     if mod_name not in sys.modules:
-        sys.modules[mod_name] = MagicMock()
+        sys.modules[mod_name] = _stub_module(mod_name)
+    # Attach submodules to their parent like a real import would
+    parent, _, child = mod_name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, sys.modules[mod_name])
 
 # Set specific constants that our code imports
 ha_const = sys.modules["homeassistant.const"]
@@ -39,6 +59,7 @@ ha_const.CONF_ENTITIES = "entities"
 ha_const.CONF_ENTITY_ID = "entity_id"
 ha_const.CONF_FORCE_UPDATE = "force_update"
 ha_const.CONF_NAME = "name"
+ha_const.CONF_RGB = "rgb"
 ha_const.CONF_TYPE = "type"
 ha_const.CONF_UNIQUE_ID = "unique_id"
 ha_const.SERVICE_TURN_OFF = "turn_off"
@@ -58,11 +79,19 @@ ha_light.ColorMode = MagicMock()
 ha_light.ColorMode.COLOR_TEMP = "color_temp"
 class _StubLightEntity:
     _attr_is_on = None
+    _attr_name = None
 
     @property
     def is_on(self):
         return self._attr_is_on
 
+    @property
+    def name(self):
+        return self._attr_name
+
+    async def async_added_to_hass(self):
+        """Nothing to set up without a real Entity."""
+
 ha_light.LightEntity = _StubLightEntity
 ha_light.DOMAIN = "light"
 
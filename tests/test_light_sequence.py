@@ -0,0 +1,126 @@
+"""Tests for parsing and stepping LightSequence patterns."""
+
+import pytest
+
+from custom_components.color_notify.utils.light_sequence import (
+    LightSequence,
+    shared_color_info,
+)
+
+RED = '{"rgb": [255, 0, 0], "delay": 1}'
+GREEN = '{"rgb": [0, 255, 0], "delay": 2}'
+BLUE = '{"rgb": [0, 0, 255]}'
+
+
+def run_to_end(sequence: LightSequence, limit: int = 50) -> list[tuple]:
+    """Advance a sequence until it finishes, returning each (rgb, delay)."""
+    steps = []
+    for _ in range(limit):
+        delay = sequence.advance()
+        steps.append((sequence.color.rgb, delay))
+        if delay is None:
+            break
+    return steps
+
+
+class TestAdvance:
+    """advance() runs steps up to each delay."""
+
+    def test_plain_pattern(self):
+        sequence = LightSequence.create_from_pattern([RED, GREEN, BLUE])
+        assert run_to_end(sequence) == [
+            ((255, 0, 0), 1),
+            ((0, 255, 0), 2),
+            ((0, 0, 255), None),
+        ]
+        # A finished sequence stays finished
+        assert sequence.advance() is None
+
+    def test_loop_repeats_body(self):
+        sequence = LightSequence.create_from_pattern(["[", RED, GREEN, "],1", BLUE])
+        assert not sequence.loops_forever
+        assert [delay for _, delay in run_to_end(sequence)] == [1, 2, 1, 2, None]
+
+    def test_nested_loops(self):
+        sequence = LightSequence.create_from_pattern(
+            ["[", RED, "[", GREEN, "],1", "],1"]
+        )
+        assert [delay for _, delay in run_to_end(sequence)] == [
+            1,
+            2,
+            2,
+            1,
+            2,
+            2,
+            None,
+        ]
+
+    def test_forever_loop(self):
+        sequence = LightSequence.create_from_pattern(["[", RED, GREEN, "]"])
+        assert sequence.loops_forever
+        assert [sequence.advance() for _ in range(6)] == [1, 2, 1, 2, 1, 2]
+
+    def test_color_entries(self):
+        color = shared_color_info((1, 2, 3))
+        sequence = LightSequence.create_from_pattern([color])
+        assert sequence.color is color
+        assert sequence.advance() is None
+        assert sequence.color is color
+
+
+class TestRewind:
+    """rewind() restarts a sequence without re-parsing it."""
+
+    def test_rewind_after_finish(self):
+        sequence = LightSequence.create_from_pattern([RED, GREEN, BLUE])
+        first_run = run_to_end(sequence)
+        sequence.rewind()
+        assert sequence.color.rgb == (255, 0, 0)
+        assert run_to_end(sequence) == first_run
+
+    def test_rewind_mid_loop_resets_loop_counts(self):
+        pattern = ["[", RED, GREEN, "],1", BLUE]
+        sequence = LightSequence.create_from_pattern(pattern)
+        for _ in range(3):
+            sequence.advance()
+        sequence.rewind()
+        assert run_to_end(sequence) == run_to_end(
+            LightSequence.create_from_pattern(pattern)
+        )
+
+
+class TestSharedSteps:
+    """Sequences from one pattern share compiled steps but not run state."""
+
+    def test_same_pattern_steps_independently(self):
+        pattern = ["[", RED, GREEN, "],1", BLUE]
+        first = LightSequence.create_from_pattern(pattern)
+        second = LightSequence.create_from_pattern(pattern)
+        assert first._steps is second._steps
+
+        assert first.advance() == 1
+        assert first.advance() == 2
+        # The second sequence hasn't moved
+        assert second.color.rgb == (255, 0, 0)
+        assert [delay for _, delay in run_to_end(second)] == [1, 2, 1, 2, None]
+        # Nor did running the second one move the first
+        assert [delay for _, delay in run_to_end(first)] == [1, 2, None]
+
+
+class TestValidatePattern:
+    """validate_pattern() reports parse errors by entry."""
+
+    def test_valid_pattern(self):
+        LightSequence.validate_pattern(["[", RED, GREEN, "],1", BLUE])
+
+    def test_invalid_entry(self):
+        with pytest.raises(Exception, match="Error in entry #2"):
+            LightSequence.validate_pattern([RED, '{"rgb": 5}'])
+
+    def test_unclosed_loop(self):
+        with pytest.raises(Exception, match="was not closed"):
+            LightSequence.validate_pattern(["[", RED])
+
+    def test_unhashable_entries_are_still_validated(self):
+        with pytest.raises(Exception, match="Error in entry #3"):
+            LightSequence.validate_pattern([RED, ["not", "hashable"], "{bad"])
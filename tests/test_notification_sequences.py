@@ -0,0 +1,259 @@
+"""Tests for how the light entity orders, steps and sends notification sequences."""
+
+from collections.abc import Mapping
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, call, patch
+
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, Platform
+
+from custom_components.color_notify import light
+from custom_components.color_notify.const import MIN_COMMAND_INTERVAL_SEC
+from custom_components.color_notify.light import (
+    NotificationLightEntity,
+    _NotificationSequence,
+)
+from custom_components.color_notify.utils.light_sequence import shared_color_info
+
+RED = shared_color_info((255, 0, 0))
+GREEN = shared_color_info((0, 255, 0))
+BLUE = shared_color_info((0, 0, 255))
+
+
+class FakeLoop:
+    """Event loop clock that only moves when a test moves it."""
+
+    def __init__(self) -> None:
+        # Like a real loop clock, well past the initial last-command time
+        self.now = 1000.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class FakeConfigEntry:
+    """Minimal config entry exposing only what the light entity reads."""
+
+    def __init__(self, data: Mapping | None = None):
+        self.entry_id = "test_entry_id"
+        self.data = data if data is not None else MappingProxyType({})
+        self.options = MappingProxyType({})
+        self.title = "[Light] Test Light"
+        self.async_create_background_task = MagicMock()
+        self.async_on_unload = MagicMock()
+
+
+def make_light_entity() -> NotificationLightEntity:
+    """Create a NotificationLightEntity on a fake clock."""
+    entity = NotificationLightEntity(
+        unique_id="test_unique_id",
+        wrapped_entity_id="light.test_real_light",
+        config_entry=FakeConfigEntry(),
+    )
+    entity.hass = SimpleNamespace(loop=FakeLoop())
+    entity._wrapped_light_turn_on = AsyncMock(return_value=True)
+    return entity
+
+
+def make_sequence(
+    notify_id: str, priority: int, color=RED, **kwargs
+) -> _NotificationSequence:
+    return _NotificationSequence(
+        pattern=[color], priority=priority, notify_id=notify_id, **kwargs
+    )
+
+
+def active_ids(entity: NotificationLightEntity) -> list[str]:
+    return [notify_id for _, _, notify_id in entity._active_order]
+
+
+class TestActiveOrder:
+    """_active_order keeps active sequences sorted by priority."""
+
+    def test_insert_sorts_by_priority(self):
+        entity = make_light_entity()
+        for notify_id, priority in (("a", 10), ("b", 30), ("c", 20)):
+            entity._set_active_sequence(notify_id, make_sequence(notify_id, priority))
+
+        assert active_ids(entity) == ["b", "c", "a"]
+        assert entity._get_top_id() == "b"
+        assert entity._get_top_sequences() == [entity._active_sequences["b"]]
+
+    def test_replace_moves_sequence(self):
+        entity = make_light_entity()
+        for notify_id, priority in (("a", 10), ("b", 30), ("c", 20)):
+            entity._set_active_sequence(notify_id, make_sequence(notify_id, priority))
+
+        replacement = make_sequence("a", 40)
+        entity._set_active_sequence("a", replacement)
+
+        assert active_ids(entity) == ["a", "b", "c"]
+        assert entity._get_top_sequence() is replacement
+
+    def test_priority_change_resorts(self):
+        entity = make_light_entity()
+        for notify_id, priority in (("a", 10), ("b", 30)):
+            entity._set_active_sequence(notify_id, make_sequence(notify_id, priority))
+
+        entity._active_sequences["a"].priority = 50
+        entity._update_active_order("a")
+
+        assert active_ids(entity) == ["a", "b"]
+
+    def test_pop(self):
+        entity = make_light_entity()
+        sequence = make_sequence("a", 10)
+        entity._set_active_sequence("a", sequence)
+        entity._set_active_sequence("b", make_sequence("b", 30))
+
+        assert entity._pop_active_sequence("a") is sequence
+        assert entity._pop_active_sequence("a") is None
+        assert active_ids(entity) == ["b"]
+        entity._pop_active_sequence("b")
+        assert entity._get_top_sequences() == []
+        assert entity._get_top_id() is None
+
+    def test_same_priority_cycles(self):
+        entity = make_light_entity()
+        for notify_id, priority in (("a", 20), ("b", 20), ("c", 10)):
+            entity._set_active_sequence(notify_id, make_sequence(notify_id, priority))
+
+        assert entity._get_top_sequences() == [
+            entity._active_sequences["a"],
+            entity._active_sequences["b"],
+        ]
+        # Cycling moves the top sequence behind its peers, not below lower ones
+        entity._update_active_order(entity._get_top_id())
+        assert active_ids(entity) == ["b", "a", "c"]
+        entity._update_active_order(entity._get_top_id())
+        assert active_ids(entity) == ["a", "b", "c"]
+
+
+class TestAutoclear:
+    """A sequence with a zero clear delay turns its switch off when it finishes."""
+
+    def make_hass(self) -> SimpleNamespace:
+        return SimpleNamespace(
+            loop=FakeLoop(), services=SimpleNamespace(async_call=MagicMock())
+        )
+
+    def test_autoclear_when_finished(self):
+        hass = self.make_hass()
+        config_entry = FakeConfigEntry()
+        sequence = _NotificationSequence(
+            pattern=['{"rgb": [255, 0, 0], "delay": 1}', '{"rgb": [0, 0, 255]}'],
+            notify_id="switch.a",
+            clear_delay=0,
+        )
+        sequence.run(hass, config_entry)
+        assert sequence.next_deadline == hass.loop.now
+
+        assert sequence.step(0.0) is False
+        assert sequence.next_deadline == 1.0
+        config_entry.async_create_background_task.assert_not_called()
+
+        assert sequence.step(1.0) is True
+        assert not sequence.is_running()
+        assert sequence.color.rgb == (0, 0, 255)
+        config_entry.async_create_background_task.assert_called_once()
+        hass.services.async_call.assert_called_once_with(
+            Platform.SWITCH,
+            SERVICE_TURN_OFF,
+            service_data={ATTR_ENTITY_ID: "switch.a"},
+        )
+
+    def test_no_autoclear_without_zero_delay(self):
+        hass = self.make_hass()
+        config_entry = FakeConfigEntry()
+        sequence = make_sequence("switch.a", 10)
+        sequence.run(hass, config_entry)
+
+        assert sequence.step(0.0) is True
+        config_entry.async_create_background_task.assert_not_called()
+        hass.services.async_call.assert_not_called()
+
+
+class TestStepTimer:
+    """Running sequences are stepped when the step timer fires."""
+
+    def test_early_timer_steps_due_sequence(self):
+        entity = make_light_entity()
+        loop = entity.hass.loop
+        sequence = _NotificationSequence(
+            pattern=['{"rgb": [255, 0, 0], "delay": 1}', '{"rgb": [0, 0, 255]}'],
+            notify_id="a",
+        )
+        sequence.run(entity.hass, entity._config_entry)
+        entity._running_sequences["a"] = sequence
+        entity._step_due_sequences()
+        deadline = sequence.next_deadline
+        assert deadline == loop.now + 1
+
+        # asyncio may run the timer a clock tick before its deadline
+        loop.now = deadline - 0.001
+        entity._step_timer_fired(deadline)
+        entity._step_due_sequences()
+
+        assert sequence.color.rgb == (0, 0, 255)
+        assert not sequence.is_running()
+        assert entity._get_next_deadline() is None
+
+
+class TestCommandRateLimit:
+    """Colors arriving within MIN_COMMAND_INTERVAL_SEC are coalesced."""
+
+    async def test_commands_coalesce(self):
+        entity = make_light_entity()
+        loop = entity.hass.loop
+        turn_on = entity._wrapped_light_turn_on
+
+        with patch.object(light, "async_call_later") as call_later:
+            entity._set_active_sequence("a", make_sequence("a", 10, RED))
+            await entity._process_sequence_list()
+            assert turn_on.await_args_list == [call(**RED.light_params)]
+
+            # Two changes inside the interval only schedule one resend
+            loop.now += MIN_COMMAND_INTERVAL_SEC / 4
+            entity._set_active_sequence("b", make_sequence("b", 20, BLUE))
+            await entity._process_sequence_list()
+            loop.now += MIN_COMMAND_INTERVAL_SEC / 4
+            entity._set_active_sequence("c", make_sequence("c", 30, GREEN))
+            await entity._process_sequence_list()
+
+            assert turn_on.await_count == 1
+            call_later.assert_called_once()
+            _, remaining, resend = call_later.call_args.args
+            assert 0 < remaining <= MIN_COMMAND_INTERVAL_SEC
+
+            # Once the gap has passed only the latest color is sent
+            resend(None)
+            assert entity._queue_event.is_set()
+            loop.now += MIN_COMMAND_INTERVAL_SEC
+            await entity._process_sequence_list()
+
+        assert turn_on.await_args_list == [
+            call(**RED.light_params),
+            call(**GREEN.light_params),
+        ]
+
+    async def test_unchanged_color_not_resent(self):
+        entity = make_light_entity()
+        entity._set_active_sequence("a", make_sequence("a", 10, RED))
+        await entity._process_sequence_list()
+        entity.hass.loop.now += 1.0
+        await entity._process_sequence_list()
+
+        entity._wrapped_light_turn_on.assert_awaited_once()
+
+    async def test_close_colors_are_sent(self):
+        entity = make_light_entity()
+        entity._set_active_sequence("a", make_sequence("a", 10, RED))
+        await entity._process_sequence_list()
+        entity.hass.loop.now += 1.0
+        nearly_red = shared_color_info((254, 0, 1))
+        entity._set_active_sequence("b", make_sequence("b", 20, nearly_red))
+        await entity._process_sequence_list()
+
+        assert entity._wrapped_light_turn_on.await_args_list == [
+            call(**RED.light_params),
+            call(**nearly_red.light_params),
+        ]
@@ -9,25 +9,17 @@ The bug: upstream code unconditionally called async_turn_on() on restore,
 causing a bright white blast on every HA restart.
 """
 
-import asyncio
-from unittest.mock import AsyncMock, MagicMock, patch
-
-import pytest
+from collections.abc import Mapping
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 from custom_components.color_notify.const import CONF_RESTORE_POWER
+from custom_components.color_notify.light import NotificationLightEntity
 
 
-class FakeState:
-    """Minimal state object returned by async_get_last_state."""
-
-    def __init__(self, state: str):
-        self.state = state
-
-
-def make_config_entry(restore_power: bool | None = None):
-    """Create a mock config entry with optional restore_power setting."""
-    entry = MagicMock()
-    data = {
+# Read-only so a test can't leak changes into the next one
+BASE_CONFIG_DATA = MappingProxyType(
+    {
         "type": "light",
         "name": "Test Light",
         "entity_id": "light.test_real_light",
@@ -38,20 +30,40 @@ def make_config_entry(restore_power: bool | None = None):
         "delay_time": {"seconds": 5},
         "peek_time": {"seconds": 5},
     }
-    if restore_power is not None:
-        data[CONF_RESTORE_POWER] = restore_power
-    entry.data = data
-    entry.options = {}
-    entry.title = "[Light] Test Light"
-    entry.async_create_background_task = MagicMock()
-    entry.async_on_unload = MagicMock()
-    return entry
+)
+
+
+class FakeState:
+    """Minimal state object returned by async_get_last_state."""
+
+    def __init__(self, state: str):
+        self.state = state
+
+
+class FakeConfigEntry:
+    """Minimal config entry exposing only what the light entity reads."""
+
+    def __init__(self, data: Mapping, options: Mapping | None = None):
+        self.entry_id = "test_entry_id"
+        self.data = data
+        self.options = options if options is not None else MappingProxyType({})
+        self.title = "[Light] Test Light"
+        # Close the worker coroutine instead of running it
+        self.async_create_background_task = MagicMock(
+            side_effect=lambda hass, coro, name=None: coro.close()
+        )
+        self.async_on_unload = MagicMock()
+
+
+def make_config_entry(restore_power: bool | None = None):
+    """Create a fake config entry with optional restore_power setting."""
+    if restore_power is None:
+        return FakeConfigEntry(BASE_CONFIG_DATA)
+    return FakeConfigEntry({**BASE_CONFIG_DATA, CONF_RESTORE_POWER: restore_power})
 
 
 def make_light_entity(config_entry):
     """Create a NotificationLightEntity with mocked HA internals."""
-    from custom_components.color_notify.light import NotificationLightEntity
-
     entity = NotificationLightEntity(
         unique_id="test_unique_id",
         wrapped_entity_id="light.test_real_light",
@@ -59,10 +71,14 @@ def make_light_entity(config_entry):
     )
 
     # Mock HA internals that async_added_to_hass needs
-    entity.hass = MagicMock()
-    entity.hass.states.get.return_value = None  # wrapped entity not available yet
-    entity.hass.bus.async_fire = MagicMock()
-    entity.hass.async_create_task = MagicMock()
+    # Plain namespaces, so a missing attribute fails instead of being invented
+    entity.hass = SimpleNamespace(
+        # Wrapped entity not available yet
+        states=SimpleNamespace(get=lambda entity_id: None),
+        bus=SimpleNamespace(async_fire=MagicMock()),
+        # Close scheduled coroutines so they aren't left unawaited
+        async_create_task=MagicMock(side_effect=lambda coro: coro.close()),
+    )
     entity.async_write_ha_state = MagicMock()
     entity.async_schedule_update_ha_state = MagicMock()
 
@@ -88,7 +104,6 @@ class TestRestorePowerDefault:
         entity = make_light_entity(config_entry)
         assert entity._restore_power is False
 
-    @pytest.mark.asyncio
     async def test_restore_on_state_no_turn_on(self):
         """When last state was ON and restore_power=False, don't call turn_on."""
         config_entry = make_config_entry(restore_power=False)
@@ -97,16 +112,7 @@ class TestRestorePowerDefault:
         # Mock async_get_last_state to return ON
         entity.async_get_last_state = AsyncMock(return_value=FakeState("on"))
 
-        # Run the restore portion of async_added_to_hass
-        restored_state = await entity.async_get_last_state()
-        if restored_state:
-            entity._attr_is_on = restored_state.state == "on"
-            entity.async_schedule_update_ha_state(True)
-            if entity._restore_power:
-                if entity.is_on:
-                    entity.hass.async_create_task(entity.async_turn_on())
-                else:
-                    entity.hass.async_create_task(entity.async_turn_off())
+        await entity.async_added_to_hass()
 
         # Internal state should be ON
         assert entity._attr_is_on is True
@@ -114,7 +120,6 @@ class TestRestorePowerDefault:
         entity.async_turn_on.assert_not_awaited()
         entity.hass.async_create_task.assert_not_called()
 
-    @pytest.mark.asyncio
     async def test_restore_off_state_no_turn_off(self):
         """When last state was OFF and restore_power=False, don't call turn_off."""
         config_entry = make_config_entry(restore_power=False)
@@ -122,15 +127,7 @@ class TestRestorePowerDefault:
 
         entity.async_get_last_state = AsyncMock(return_value=FakeState("off"))
 
-        restored_state = await entity.async_get_last_state()
-        if restored_state:
-            entity._attr_is_on = restored_state.state == "on"
-            entity.async_schedule_update_ha_state(True)
-            if entity._restore_power:
-                if entity.is_on:
-                    entity.hass.async_create_task(entity.async_turn_on())
-                else:
-                    entity.hass.async_create_task(entity.async_turn_off())
+        await entity.async_added_to_hass()
 
         assert entity._attr_is_on is False
         entity.async_turn_off.assert_not_awaited()
@@ -146,7 +143,6 @@ class TestRestorePowerEnabled:
         entity = make_light_entity(config_entry)
         assert entity._restore_power is True
 
-    @pytest.mark.asyncio
     async def test_restore_on_state_calls_turn_on(self):
         """When last state was ON and restore_power=True, call turn_on."""
         config_entry = make_config_entry(restore_power=True)
@@ -154,20 +150,11 @@ class TestRestorePowerEnabled:
 
         entity.async_get_last_state = AsyncMock(return_value=FakeState("on"))
 
-        restored_state = await entity.async_get_last_state()
-        if restored_state:
-            entity._attr_is_on = restored_state.state == "on"
-            entity.async_schedule_update_ha_state(True)
-            if entity._restore_power:
-                if entity.is_on:
-                    entity.hass.async_create_task(entity.async_turn_on())
-                else:
-                    entity.hass.async_create_task(entity.async_turn_off())
+        await entity.async_added_to_hass()
 
         assert entity._attr_is_on is True
         entity.hass.async_create_task.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_restore_off_state_calls_turn_off(self):
         """When last state was OFF and restore_power=True, call turn_off."""
         config_entry = make_config_entry(restore_power=True)
@@ -175,15 +162,7 @@ class TestRestorePowerEnabled:
 
         entity.async_get_last_state = AsyncMock(return_value=FakeState("off"))
 
-        restored_state = await entity.async_get_last_state()
-        if restored_state:
-            entity._attr_is_on = restored_state.state == "on"
-            entity.async_schedule_update_ha_state(True)
-            if entity._restore_power:
-                if entity.is_on:
-                    entity.hass.async_create_task(entity.async_turn_on())
-                else:
-                    entity.hass.async_create_task(entity.async_turn_off())
+        await entity.async_added_to_hass()
 
         assert entity._attr_is_on is False
         entity.hass.async_create_task.assert_called_once()
@@ -192,7 +171,6 @@ class TestRestorePowerEnabled:
 class TestRestorePowerNoState:
     """When there's no restored state, nothing should happen regardless of config."""
 
-    @pytest.mark.asyncio
     async def test_no_restored_state_does_nothing(self):
         """No previous state — no restore, no commands."""
         config_entry = make_config_entry(restore_power=True)
@@ -200,15 +178,7 @@ class TestRestorePowerNoState:
 
         entity.async_get_last_state = AsyncMock(return_value=None)
 
-        restored_state = await entity.async_get_last_state()
-        if restored_state:
-            entity._attr_is_on = restored_state.state == "on"
-            entity.async_schedule_update_ha_state(True)
-            if entity._restore_power:
-                if entity.is_on:
-                    entity.hass.async_create_task(entity.async_turn_on())
-                else:
-                    entity.hass.async_create_task(entity.async_turn_off())
+        await entity.async_added_to_hass()
 
         entity.hass.async_create_task.assert_not_called()
         entity.async_schedule_update_ha_state.assert_not_called()